@@ -0,0 +1,93 @@
+"""
+Extraction of the mod files of a synthetic solid 7z: one extract call per member (decompresses the solid
+block from the start every time) against a single extract of all members with SevenZipProgress.
+    python benchmarks/bench_7z.py [--members 40] [--member-kb 500]
+Needs py7zr
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+
+from benchutils import Report
+
+import py7zr
+
+from ui.utils.archives import SevenZipProgress
+
+
+def MakeArchive(path: str, members: int, memberSize: int):
+    rnd = random.Random(0)
+
+    with py7zr.SevenZipFile(path, "w") as archive:
+        archive.writestr(b"readme", "readme.txt")
+        for n in range(members):
+            # Noise with repeated runs, compresses like audio banks do (a bit)
+            data = bytes(rnd.getrandbits(8) for _ in range(memberSize // 4)) * 4
+            archive.writestr(data, f"sounds/sound_{n}.wem")
+
+
+def ModFiles(names):
+    return [file for file in names if file.endswith((".bmod", ".wem", ".bnk", ".bin"))]
+
+
+def PerMember(archivePath: str, outPath: str) -> int:
+    reported = 0
+    with py7zr.SevenZipFile(archivePath) as archive:
+        files = ModFiles(archive.getnames())
+        for file in files:
+            archive.extract(outPath, [file])
+            archive.reset()
+            reported += 1
+
+    return reported
+
+
+def SinglePass(archivePath: str, outPath: str) -> int:
+    reported = []
+    with py7zr.SevenZipFile(archivePath) as archive:
+        files = ModFiles(archive.getnames())
+        archive.extract(outPath, files, callback=SevenZipProgress(files, lambda n, file: reported.append(file)))
+
+    return len(reported)
+
+
+def Files(path: str) -> dict:
+    files = {}
+    for root, dirs, names in os.walk(path):
+        for name in names:
+            with open(os.path.join(root, name), "rb") as file:
+                files[os.path.relpath(os.path.join(root, name), path)] = file.read()
+
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--members", type=int, default=40)
+    parser.add_argument("--member-kb", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        archivePath = os.path.join(folder, "mod.7z")
+        MakeArchive(archivePath, args.members, args.member_kb * 1024)
+
+        results = {}
+        baseline = None
+        for name, extract in (("extract per member", PerMember), ("single pass", SinglePass)):
+            outPath = os.path.join(folder, name.replace(" ", "_"))
+            start = time.perf_counter()
+            reported = extract(archivePath, outPath)
+            seconds = time.perf_counter() - start
+
+            results[name] = Files(outPath)
+            Report(f"{name} ({reported} progress reports)", seconds, baseline)
+            baseline = seconds
+
+        assert results["extract per member"] == results["single pass"], "extracted files differ"
+        print(f"{args.members} members of {args.member_kb} KB, same files extracted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Loading mods data into Mods: bulk Mods.addMods against one Mods.addMod per mod (sorted after every mod).
+Time per mod of addMods stays flat as the library grows.
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_addmods.py [--counts 1000 2000 4000 8000] [--single-max 1000]
+"""
+import os
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchutils import ModsData
+
+from PySide6.QtWidgets import QApplication
+
+from ui.ui_handler.mods import Mods
+
+
+def Load(app: QApplication, modsData: list, bulk: bool) -> float:
+    mods = Mods(*[lambda *args: None] * 6)
+    mods.resize(1000, 700)
+    mods.show()
+    app.processEvents()
+
+    start = time.perf_counter()
+    if bulk:
+        mods.addMods(modsData)
+    else:
+        for modData in modsData:
+            mods.addMod(**modData)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+
+    mods.close()
+    mods.deleteLater()
+    app.processEvents()
+
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 2000, 4000, 8000])
+    parser.add_argument("--single-max", type=int, default=1000, help="largest count loaded one mod at a time")
+    args = parser.parse_args()
+
+    app = QApplication([])
+
+    # Mods keeps timestamps and formatted descriptions in the working directory
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+
+        for count in args.counts:
+            modsData = ModsData(count)
+
+            for name, bulk in (("addMods", True), ("addMod per mod", False)):
+                if not bulk and count > args.single_max:
+                    continue
+
+                seconds = Load(app, modsData, bulk)
+                print(f"{count:>6} mods   {name:<16} {seconds * 1000:10.1f} ms   {seconds / count * 1e6:8.1f} us/mod")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Core data delivery to the gui thread: the old 10 ms QTimer poll against the listener thread (PollData).
+Reports idle cpu time and gui wakeups, and the latency of messages sent at random intervals: a message after
+an idle period waits up to POLL_MAX (5 ms) on the listener, against up to 10 ms on the timer, bursts are
+drained at once instead of one message per tick.
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_controller.py [--seconds 3] [--messages 100]
+"""
+import os
+import time
+import queue
+import random
+import argparse
+import threading
+import statistics
+import collections
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchutils import Report
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+from ui.utils.mainthread import QExecMainThread
+from ui.utils.poll import PollData
+
+
+class FakeController:
+    """Non-blocking getData over a queue, like core.Controller"""
+
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+
+    def getData(self):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+
+class TimerModel:
+    """ModLoader before the listener thread: one getData per 10 ms tick on the gui thread"""
+
+    def __init__(self, controller: FakeController, handle, seconds: float):
+        self.controller = controller
+        self.handle = handle
+        self.wakeups = 0
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(10)
+
+    def tick(self):
+        self.wakeups += 1
+        data = self.controller.getData()
+        if data is not None:
+            self.handle(data)
+
+
+class ListenerModel:
+    """ModLoader.controllerListener / controllerHandler"""
+
+    def __init__(self, controller: FakeController, handle, seconds: float):
+        QExecMainThread.init(self)
+
+        self.controller = controller
+        self.handle = handle
+        self.wakeups = 0
+
+        self.data = collections.deque()
+        self.queued = threading.Event()
+
+        deadline = time.monotonic() + seconds
+        threading.Thread(target=self.listen, args=(deadline,), daemon=True).start()
+
+    def listen(self, deadline: float):
+        for data in PollData(self.controller.getData, deadline):
+            self.data.append(data)
+            if not self.queued.is_set():
+                self.queued.set()
+                self.handler()
+
+    @QExecMainThread
+    def handler(self):
+        self.queued.clear()
+        self.wakeups += 1
+        while self.data:
+            self.handle(self.data.popleft())
+
+
+def Run(app: QApplication, model, seconds: float, send=None) -> dict:
+    controller = FakeController()
+    latencies = []
+
+    instance = model(controller, lambda sent: latencies.append(time.perf_counter() - sent), seconds)
+
+    if send is not None:
+        threading.Thread(target=send, args=(controller,), daemon=True).start()
+
+    cpu = time.process_time()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+
+    return {"cpu": time.process_time() - cpu, "wakeups": instance.wakeups, "latencies": latencies}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--messages", type=int, default=100)
+    args = parser.parse_args()
+
+    app = QApplication([])
+
+    print(f"idle, {args.seconds} s")
+    for model in (TimerModel, ListenerModel):
+        result = Run(app, model, args.seconds)
+        print(f"    {model.__name__:<16} cpu {result['cpu'] * 1000:8.1f} ms"
+              f"   gui wakeups {result['wakeups'] / args.seconds:6.1f}/s")
+
+    # Messages at random intervals (an idle core answering now and then), and one burst
+    rnd = random.Random(0)
+    gaps = [rnd.uniform(0.001, 0.1) for _ in range(args.messages)]
+    seconds = sum(gaps) + 1
+
+    def send(controller: FakeController):
+        for gap in gaps:
+            time.sleep(gap)
+            controller.queue.put(time.perf_counter())
+
+        for _ in range(args.messages):
+            controller.queue.put(time.perf_counter())
+
+    print(f"latency, {args.messages} messages at random intervals + {args.messages} in a burst")
+    for model in (TimerModel, ListenerModel):
+        result = Run(app, model, seconds, send)
+        spaced = sorted(result["latencies"][:args.messages])
+        burst = result["latencies"][args.messages:]
+
+        Report(f"    {model.__name__} median", statistics.median(spaced))
+        Report(f"    {model.__name__} p95", spaced[int(len(spaced) * 0.95)])
+        Report(f"    {model.__name__} burst drained", max(burst) if burst else float("nan"))
+        print(f"    {len(result['latencies'])} of {2 * args.messages} delivered")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Serial and parallel downloads of a batch of mods from a local throttled http server.
+    python benchmarks/bench_download.py [--mods 10] [--size-mb 4] [--rate-mb 8] [--workers 3]
+Needs requests. Each connection is limited to --rate-mb MB/s, like a single slow connection to a mirror
+"""
+import argparse
+import tempfile
+import os
+
+from concurrent.futures import ThreadPoolExecutor
+
+from benchutils import Best, Report
+
+from tests.fileserver import FileServer
+from ui.utils.download import Downloader
+
+
+def DownloadAll(url: str, folder: str, mods: int, workers: int) -> Downloader:
+    downloader = Downloader(poolSize=workers)
+    paths = [os.path.join(folder, f"mod{n}.zip") for n in range(mods)]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda path: downloader.download(url, path), paths))
+
+    for path in paths:
+        os.remove(path)
+
+    return downloader
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mods", type=int, default=10)
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--rate-mb", type=float, default=8)
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    data = os.urandom(int(args.size_mb * 1024 * 1024))
+
+    with FileServer(data, bytesPerSecond=int(args.rate_mb * 1024 * 1024)) as server, \
+            tempfile.TemporaryDirectory() as folder:
+        serial = None
+        for workers in (1, args.workers):
+            start = len(server.requests)
+            seconds = Best(lambda: DownloadAll(server.url, folder, args.mods, workers), repeat=1)
+            requests = server.requests[start:]
+            connections = len({request["port"] for request in requests})
+
+            Report(f"{args.mods} mods, {workers} worker(s)", seconds, serial)
+            print(f"    {len(requests)} requests over {connections} connection(s)")
+            serial = serial or seconds
+
+
+if __name__ == "__main__":
+    main()
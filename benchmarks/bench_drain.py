@@ -0,0 +1,193 @@
+"""
+Throughput of install notifications handled by the gui thread, replaying a synthetic stream of
+InstallingModSwfSprite / InstallingModSwfSound notifications into a real ProgressDialog:
+the old one message per 10 ms tick with an if/elif chain against the time-budgeted drain with handler tables.
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_drain.py [--messages 20000] [--seconds 5] [--budget 0.008]
+"""
+import os
+import time
+import queue
+import argparse
+import collections
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import benchutils  # app modules are imported from the repo root
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout
+
+from ui.ui_handler.progressdialog import ProgressDialog
+
+
+class NotificationType:
+    LoadingMod = 0
+    ModElementsCount = 1
+    ModConflictSearchInSwf = 2
+    ModConflictNotFound = 3
+    ModConflict = 4
+    InstallingModSwf = 5
+    InstallingModSwfSprite = 6
+    InstallingModSwfSound = 7
+    InstallingModFile = 8
+    InstallingModFinished = 9
+
+
+class Environment:
+    Notification = 0
+
+
+class Notification:
+    def __init__(self, notificationType: int, *args):
+        self.notificationType = notificationType
+        self.args = args
+
+
+def Stream(messages: int) -> list:
+    stream = [(Environment.Notification, Notification(NotificationType.ModElementsCount, "hash", messages))]
+    for n in range(messages):
+        ntype = NotificationType.InstallingModSwfSprite if n % 3 else NotificationType.InstallingModSwfSound
+        stream.append((Environment.Notification, Notification(ntype, "hash", f"element_{n}")))
+
+    return stream
+
+
+class TimerModel:
+    """controllerHandler before the batched drain: one getData per 10 ms tick, if/elif dispatch"""
+
+    def __init__(self, dialog: ProgressDialog, stream: list):
+        self.dialog = dialog
+        self.handled = 0
+        self.longest = 0
+
+        self.queue = queue.SimpleQueue()
+        for data in stream:
+            self.queue.put(data)
+
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(10)
+
+    def tick(self):
+        start = time.perf_counter()
+        try:
+            data = self.queue.get_nowait()
+        except queue.Empty:
+            return
+
+        if data[0] == Environment.Notification:
+            notification = data[1]
+            ntype = notification.notificationType
+
+            if ntype == NotificationType.LoadingMod:
+                pass
+            elif ntype == NotificationType.ModElementsCount:
+                self.dialog.setMaximum(notification.args[1])
+            elif ntype == NotificationType.ModConflictSearchInSwf:
+                self.dialog.setContent(f"Searching in: {notification.args[1]}")
+                self.dialog.addValue()
+            elif ntype == NotificationType.ModConflictNotFound:
+                pass
+            elif ntype == NotificationType.ModConflict:
+                pass
+            elif ntype == NotificationType.InstallingModSwf:
+                self.dialog.setContent(f"Open game file: {notification.args[1]}")
+            elif ntype == NotificationType.InstallingModSwfSprite:
+                self.dialog.setContent(f"Installing sprite: {notification.args[1]}")
+                self.dialog.addValue()
+            elif ntype == NotificationType.InstallingModSwfSound:
+                self.dialog.setContent(f"Installing sound: {notification.args[1]}")
+                self.dialog.addValue()
+
+        self.handled += 1
+        self.longest = max(self.longest, time.perf_counter() - start)
+
+
+class DrainModel:
+    """ModLoader.controllerHandler: drain the backlog for `budget` seconds per wakeup, dispatch by table"""
+
+    def __init__(self, dialog: ProgressDialog, stream: list, budget: float):
+        self.dialog = dialog
+        self.budget = budget
+        self.handled = 0
+        self.longest = 0
+
+        self.data = collections.deque(stream)
+
+        self.environmentHandlers = {Environment.Notification: self.onNotification}
+        self.notificationHandlers = {
+            NotificationType.ModElementsCount: lambda n: self.dialog.setMaximum(n.args[1]),
+            NotificationType.InstallingModSwfSprite: lambda n: self.dialog.addProgress(f"Installing sprite: {n.args[1]}"),
+            NotificationType.InstallingModSwfSound: lambda n: self.dialog.addProgress(f"Installing sound: {n.args[1]}"),
+        }
+
+        QTimer.singleShot(0, self.handler)
+
+    def handler(self):
+        start = time.perf_counter()
+        deadline = start + self.budget
+
+        while self.data:
+            data = self.data.popleft()
+            handler = self.environmentHandlers.get(data[0], None)
+            if handler is not None:
+                handler(data)
+            self.handled += 1
+
+            if time.perf_counter() >= deadline:
+                break
+
+        self.longest = max(self.longest, time.perf_counter() - start)
+
+        if self.data:
+            QTimer.singleShot(0, self.handler)
+
+    def onNotification(self, data):
+        handler = self.notificationHandlers.get(data[1].notificationType, None)
+        if handler is not None:
+            handler(data[1])
+
+
+def Run(app: QApplication, window: QWidget, model, total: int, seconds: float) -> dict:
+    dialog = ProgressDialog(window)
+    dialog.show()
+
+    instance = model(dialog)
+
+    start = time.perf_counter()
+    done = QTimer()
+    done.timeout.connect(lambda: (instance.handled >= total or time.perf_counter() - start >= seconds) and app.quit())
+    done.start(1)
+    app.exec()
+    elapsed = time.perf_counter() - start
+
+    dialog.hide()
+    return {"handled": instance.handled, "elapsed": elapsed, "longest": instance.longest}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--seconds", type=float, default=5, help="time limit per model")
+    parser.add_argument("--budget", type=float, default=0.008, help="drain budget per wakeup (seconds)")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    window = QWidget()
+    window.setLayout(QVBoxLayout())
+    window.resize(800, 600)
+    window.show()
+
+    stream = Stream(args.messages)
+    models = {"timer (1 per 10 ms tick)": lambda dialog: TimerModel(dialog, stream),
+              f"drain ({args.budget * 1000:g} ms budget)": lambda dialog: DrainModel(dialog, stream, args.budget)}
+
+    for name, model in models.items():
+        result = Run(app, window, model, len(stream), args.seconds)
+        print(f"{name:<28} {result['handled']:>7} of {len(stream)} in {result['elapsed']:6.2f} s"
+              f"   {result['handled'] / result['elapsed']:10.0f} msg/s"
+              f"   longest gui stall {result['longest'] * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Idle mod detail pane: paint events against layout runs of Mods.onResize while the pane is repainted
+(like the mouse moving over it), for the layout key check against the old layout on every paint event.
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_modbody.py [--seconds 2]
+"""
+import os
+import time
+import argparse
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchutils import ModsData
+
+from PySide6.QtCore import QObject, QEvent, QTimer
+from PySide6.QtWidgets import QApplication
+
+from ui.ui_handler.mods import Mods
+
+
+class Counter(QObject):
+    """Counts paint events of a widget, old mode also runs the layout on each of them like the old event filter"""
+
+    def __init__(self, mods: Mods, old: bool):
+        super().__init__()
+
+        self.mods = mods
+        self.old = old
+        self.paints = 0
+
+    def eventFilter(self, qobject, event):
+        if event.type() == QEvent.Paint:
+            self.paints += 1
+            if self.old:
+                # Old onResize had no layout key, it always did the layout work
+                self.mods.bodyLayoutKey = None
+                self.mods.onResize()
+
+        return False
+
+
+def Run(app: QApplication, seconds: float, old: bool) -> dict:
+    mods = Mods(*[lambda *args: None] * 6)
+    mods.resize(1000, 700)
+    mods.show()
+    mods.addMods(ModsData(10))
+    app.processEvents()
+
+    # Layout work of onResize ends with setMinimumHeight of the description
+    layouts = [0]
+    setMinimumHeight = mods.body.modDescription.setMinimumHeight
+
+    def countedSetMinimumHeight(height):
+        layouts[0] += 1
+        setMinimumHeight(height)
+
+    mods.body.modDescription.setMinimumHeight = countedSetMinimumHeight
+
+    counter = Counter(mods, old)
+    mods.ui.modBody.installEventFilter(counter)
+
+    # Hover over the pane repaints it
+    hover = QTimer()
+    hover.timeout.connect(mods.ui.modBody.update)
+    hover.start(10)
+
+    cpu = time.process_time()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    cpu = time.process_time() - cpu
+
+    hover.stop()
+    mods.close()
+    mods.deleteLater()
+    app.processEvents()
+
+    return {"paints": counter.paints, "layouts": layouts[0], "cpu": cpu}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=2)
+    args = parser.parse_args()
+
+    app = QApplication([])
+
+    # Mods keeps timestamps and formatted descriptions in the working directory
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+
+        for name, old in (("layout on every paint", True), ("layout key", False)):
+            result = Run(app, args.seconds, old)
+            print(f"{name:<24} {result['paints']:>5} paints   {result['layouts']:>5} layout runs"
+                  f"   cpu {result['cpu'] * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
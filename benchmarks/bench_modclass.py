@@ -0,0 +1,47 @@
+"""
+Memory of the mod catalogue: bytes per mod retained by ModClass records built from core mods data,
+after the mods data itself is dropped. Compared with ModClass before __slots__ and interning (--old-revision).
+    python benchmarks/bench_modclass.py [--count 10000]
+"""
+import gc
+import argparse
+import tracemalloc
+
+from benchutils import LoadRevision, ModsData
+
+from ui.ui_handler.modclass import ModClass
+
+
+def BytesPerMod(modClass, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    # Core data is dropped once the records are built, like after GetModsData
+    modsData = ModsData(count)
+    mods = {modData["hash"]: modClass(**modData) for modData in modsData}
+    del modsData
+    gc.collect()
+
+    retained = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    assert len(mods) == count
+    return retained / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--old-revision", default="8c6dd8c~1")
+    args = parser.parse_args()
+
+    OldModClass = LoadRevision(args.old_revision, "ui/ui_handler/modclass.py",
+                               "ui.ui_handler.modclass", "ui.ui_handler").ModClass
+
+    for name, modClass in ((f"ModClass [{args.old_revision}]", OldModClass), ("ModClass", ModClass)):
+        print(f"{name:<24} {BytesPerMod(modClass, args.count):8.0f} bytes per mod at {args.count} mods")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Mod list at 100 / 1k / 10k mods: ModsListModel + ModsListView against the old per-mod ModButton widgets.
+Reports time to fill and show the list, to sort it, to search it (one keystroke per query; the old widgets hide
+half of the rows) and the memory it takes.
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_modslist.py [--counts 100 1000 10000] [--old-max 1000]
+Old ModButton is loaded from the commit before the model/view list (--old-revision)
+"""
+import os
+import time
+import argparse
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchutils import LoadRevision, ModsData, Rss
+
+from PySide6.QtWidgets import QApplication, QScrollArea, QWidget, QVBoxLayout
+
+from ui.ui_handler.modclass import ModClass
+from ui.ui_handler.modslist import ModsListModel, ModsFilterModel, ModsListView
+from ui.utils.searchindex import SearchIndex
+
+
+# Search queries typed one after another, each is one keystroke (a textChanged of the search field)
+QUERIES = ["mod 1", "s", "", "author 3"]
+
+
+def ModClasses(count: int):
+    return [ModClass(**modData) for modData in ModsData(count)]
+
+
+def Measure(app: QApplication, steps: dict) -> dict:
+    results = {}
+    rss = Rss()
+
+    for name, step in steps.items():
+        start = time.perf_counter()
+        step()
+        app.processEvents()
+        results[name] = time.perf_counter() - start
+
+    if rss is not None:
+        results["memory"] = Rss() - rss
+
+    return results
+
+
+def ModelView(app: QApplication, modClasses: list) -> dict:
+    view = ModsListView()
+    view.resize(300, 700)
+    model = ModsListModel(view)
+    modsFilter = ModsFilterModel(view)
+    modsFilter.setSourceModel(model)
+    view.setModel(modsFilter)
+    searchIndex = SearchIndex()
+
+    def fill():
+        model.addMods(modClasses)
+        searchIndex.update((mod.hash, mod.name, mod.author, mod.gameVersion, mod.tags) for mod in modClasses)
+        view.show()
+
+    steps = {"fill + show": fill, "sort": lambda: model.sortMods(lambda modClass: modClass.name.lower())}
+    # Mods.searchEvent
+    steps.update((f"search '{query}'", lambda query=query: modsFilter.setVisible(searchIndex.search(query)))
+                 for query in QUERIES)
+
+    results = Measure(app, steps)
+
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+
+    return results
+
+
+def Widgets(app: QApplication, modClasses: list, ModButton) -> dict:
+    scroll = QScrollArea()
+    scroll.resize(300, 700)
+    scroll.setWidgetResizable(True)
+    frame = QWidget()
+    frame.setLayout(QVBoxLayout())
+    scroll.setWidget(frame)
+    buttons = []
+
+    def fill():
+        for modClass in modClasses:
+            button = ModButton(modClass, lambda modClass: None)
+            buttons.append(button)
+            frame.layout().addWidget(button)
+        scroll.show()
+
+    def sort():
+        # Old Mods.sortMods: every button is removed and added again in the new order
+        for button in buttons:
+            button.remove()
+        for button in sorted(buttons, key=lambda button: button.modClass.name.lower()):
+            button.restore(frame)
+
+    def search():
+        for button in buttons[::2]:
+            button.remove()
+
+    results = Measure(app, {"fill + show": fill, "sort": sort, "search": search})
+
+    scroll.close()
+    scroll.deleteLater()
+    ModButton.buttons.clear()
+    app.processEvents()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--old-max", type=int, default=1000, help="largest count the old widgets are built for")
+    parser.add_argument("--old-revision", default="d060aef~1")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    ModButton = LoadRevision(args.old_revision, "ui/ui_handler/modbutton.py",
+                             "ui.ui_handler.modbutton", "ui.ui_handler").ModButton
+
+    for count in args.counts:
+        modClasses = ModClasses(count)
+
+        runs = {"model/view": lambda: ModelView(app, modClasses)}
+        if count <= args.old_max:
+            runs["ModButton widgets"] = lambda: Widgets(app, modClasses, ModButton)
+
+        print(f"{count} mods")
+        for name, run in runs.items():
+            results = run()
+            memory = f"   memory {results['memory'] / 1024 ** 2:7.1f} MiB" if "memory" in results else ""
+            print(f"    {name:<18}" + "".join(f"   {step} {seconds * 1000:8.1f} ms"
+                                          for step, seconds in results.items() if step != "memory") + memory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+TextFormatter.format on the golden corpus and on a long generated description.
+    python benchmarks/bench_textformater.py [--against <git revision>]
+--against also times the formatter of that revision (e.g. the commit before the single pass formatter)
+"""
+import os
+import json
+import random
+import argparse
+
+from benchutils import ROOT, Best, LoadRevision, Report
+
+from ui.utils.textformater import TextFormatter
+
+
+def LongDescription(lines: int = 2000) -> str:
+    rnd = random.Random(0)
+    words = ["mod", "sound", "<b>bold</b>", "<i>italic</i>", "<color='#ff8800'>orange</color>",
+             "<url='https://gamebanana.com/mods/1'>link</url>", "<size='12px'>small</size>", "&", "''q''"]
+    body = "\n".join(" ".join(rnd.choice(words) for _ in range(12)) for _ in range(lines))
+    return f"<center><b>Release notes</b></center>\n<plist>\n<el>one</el>\n<el>two</el>\n</plist>\n{body}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--against", help="git revision to compare against")
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "tests", "data", "textformater_golden.json"), "r", encoding="UTF-8") as file:
+        corpus = [case["text"] for case in json.load(file)]
+    description = LongDescription()
+
+    formatters = {"current": TextFormatter}
+    if args.against:
+        formatters[args.against] = LoadRevision(args.against, "ui/utils/textformater.py", "textformater").TextFormatter
+
+    for name, text in (("corpus", corpus), ("long description", [description])):
+        baseline = None
+        for revision, formatter in reversed(formatters.items()):
+            seconds = Best(lambda: [formatter.format(item) for item in text], repeat=5)
+            Report(f"{name} [{revision}]", seconds, baseline if revision == "current" else None)
+            baseline = seconds
+
+
+if __name__ == "__main__":
+    main()
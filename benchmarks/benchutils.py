@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+import types
+import random
+import subprocess
+
+from typing import Callable, List, Optional
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Benchmarks are run as scripts (python benchmarks/bench_*.py), modules of the app are imported from the repo root
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def Best(func: Callable[[], object], number: int = 1, repeat: int = 5) -> float:
+    """Best time of `repeat` runs of `number` calls, in seconds per call"""
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+
+    return best / number
+
+
+def LoadRevision(revision: str, path: str, name: str, package: str = None) -> types.ModuleType:
+    """
+    Module `path` (relative to the repo root) as it was at git `revision`, to compare against.
+    Relative imports of the module are resolved in `package` (e.g. "ui.ui_handler")
+    """
+    source = subprocess.check_output(["git", "show", f"{revision}:{path}"], cwd=ROOT, text=True, encoding="UTF-8")
+
+    module = types.ModuleType(name)
+    module.__file__ = f"{revision}:{path}"
+    module.__package__ = package
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+
+    return module
+
+
+def Report(name: str, seconds: float, baseline: float = None):
+    line = f"{name:<40} {seconds * 1000:10.3f} ms"
+    if baseline is not None:
+        line += f"   x{baseline / seconds:.1f}"
+
+    print(line)
+
+
+def Rss() -> Optional[int]:
+    """Resident memory of the process in bytes (Linux only, None elsewhere)"""
+    try:
+        with open("/proc/self/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    return None
+
+
+def Copy(text: str) -> str:
+    """New string object equal to `text`"""
+    return (text + ".")[:-1]
+
+
+def ModsData(count: int, seed: int = 0) -> List[dict]:
+    """
+    Mods data like the core sends in GetModsData, with authors, versions and tags repeated across mods.
+    Like data received from the core, every mod has its own copies of the repeated strings
+    """
+    rnd = random.Random(seed)
+    authors = [f"Author {n}" for n in range(max(1, count // 20))]
+    tags = ["Skin", "Sound", "Map", "UI", "Weapon", "Emote", "Podium", "Sidekick"]
+    gameVersions = ["7.10", "7.11", "8.00", "8.01"]
+
+    return [{"gameVersion": Copy(rnd.choice(gameVersions)),
+             "name": f"Mod {n} {rnd.choice(tags)} pack {rnd.randint(0, 10 ** 6)}",
+             "author": Copy(rnd.choice(authors)),
+             "version": f"1.{rnd.randint(0, 9)}",
+             "description": f"<b>Mod {n}</b>\n<color='#ff8800'>{rnd.choice(tags)}</color> for <i>everyone</i>\n" * 3,
+             "tags": [Copy(tag) for tag in rnd.sample(tags, 2)],
+             "previewsPaths": [],
+             "hash": f"{n:032x}",
+             "platform": Copy("Steam"),
+             "installed": rnd.random() < 0.3,
+             "currentVersion": rnd.random() < 0.8,
+             "modFileExist": rnd.random() < 0.95,
+             "modPath": os.path.join("Mods", f"mod_{n}.bmod"),
+             "modCachePath": os.path.join("ModsCache", f"{n:032x}"),
+             "dateAdded": 1.6e9 + n}
+            for n in range(count)]
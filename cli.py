@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import argparse
+import traceback
+
+from ui.utils.progress import ProgressCounter
+from ui.utils.files import FreeFileName, CopyFile
+from ui.utils.poll import PollData
+from ui.utils.version import VERSION
+
+
+class Commands:
+    INSTALL = "install"
+    UNINSTALL = "uninstall"
+    LIST = "list"
+    REINSTALL_ALL = "reinstall-all"
+    STATUS = "status"
+
+
+def Print(event: str, **data):
+    print(json.dumps({"event": event, **data}, ensure_ascii=False, default=str), flush=True)
+
+
+class CliError(Exception):
+    pass
+
+
+class CliTimeout(CliError):
+    pass
+
+
+class Cli:
+    def __init__(self, modsPath: str, force: bool = False, progressRate: int = 5, timeout: float = None):
+        from main import LoadCore, PROGRAM_NAME
+
+        self.timeout = timeout
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+
+        if not LoadCore():
+            raise CliError("Java not found!")
+
+        import core
+        from core import NotificationType, Environment
+
+        self.core = core
+        self.NotificationType = NotificationType
+        self.Environment = Environment
+
+        self.programName = PROGRAM_NAME
+        self.modsPath = modsPath
+        self.force = force
+
+        self.progress = ProgressCounter(progressRate)
+        self.progressTypes = [NotificationType.ModConflictSearchInSwf,
+                              NotificationType.InstallingModSwfSprite,
+                              NotificationType.InstallingModSwfSound,
+                              NotificationType.InstallingModFile,
+                              NotificationType.InstallingModFileCache,
+                              NotificationType.UninstallingModSwfSprite,
+                              NotificationType.UninstallingModSwfSound,
+                              NotificationType.UninstallingModFile]
+
+        self.mods = {}
+        self.errors = 0
+
+        os.makedirs(self.modsPath, exist_ok=True)
+
+        self.controller = core.Controller()
+        self.controller.setModsPath(self.modsPath)
+
+    def wait(self, predicate):
+        """Read core data until `predicate(cmd, payload)` returns True, raise CliTimeout when the deadline passes"""
+        for data in PollData(self.controller.getData, self.deadline):
+            cmd, payload = data[0], data[1] if len(data) > 1 else None
+
+            if cmd == self.Environment.Notification:
+                self.notification(payload)
+
+            if predicate(cmd, payload):
+                return payload
+
+        raise CliTimeout(f"Timed out after {self.timeout} seconds")
+
+    def notification(self, notification):
+        ntype = notification.notificationType
+
+        if ntype in self.progressTypes:
+            self.progress.add(str(notification.args[1]))
+            if self.progress.due():
+                Print("progress", mod=notification.args[0], **self.progress.snapshot())
+
+        elif ntype == self.NotificationType.ModElementsCount:
+            Print("elements", mod=notification.args[0], count=notification.args[1])
+
+        elif ntype not in (self.NotificationType.LoadingMod,
+                           self.NotificationType.ModConflictNotFound,
+                           self.NotificationType.ModConflict,
+                           self.NotificationType.InstallingModSwf,
+                           self.NotificationType.UninstallingModSwf,
+                           self.NotificationType.InstallingModFinished,
+                           self.NotificationType.UninstallingModFinished):
+            self.errors += 1
+            Print("notification", type=getattr(ntype, "name", ntype), args=list(notification.args))
+
+    def isNotification(self, payload, ntype, modHash=None):
+        return (payload is not None and getattr(payload, "notificationType", None) == ntype and
+                (modHash is None or payload.args[0] == modHash))
+
+    def loadMods(self):
+        self.controller.reloadMods()
+        self.controller.getModsData()
+
+        modsData = self.wait(lambda cmd, payload: cmd == self.Environment.GetModsData)
+        self.mods = {modData.get("hash", ""): modData for modData in modsData}
+
+    def findMod(self, target: str) -> dict:
+        if target in self.mods:
+            return self.mods[target]
+
+        if os.path.exists(target):
+            modPath = os.path.normcase(os.path.abspath(target))
+            for modData in self.mods.values():
+                if os.path.normcase(os.path.abspath(modData.get("modPath", "") or "")) == modPath:
+                    return modData
+
+        raise CliError(f"Mod '{target}' not found")
+
+    def importMod(self, filePath: str) -> str:
+        """Copy mod file to mods folder if it is outside it, return path of the mod inside mods folder"""
+        filePath = os.path.abspath(filePath)
+
+        if filePath.startswith(os.path.abspath(self.modsPath)):
+            return filePath
+
+        dest = os.path.join(self.modsPath, FreeFileName(self.modsPath, os.path.basename(filePath)))
+        CopyFile(filePath, dest)
+        Print("imported", source=filePath, path=dest)
+
+        return dest
+
+    def installBaseMod(self):
+        self.controller.installBaseMod(f"{self.programName}: {VERSION}")
+        self.wait(lambda cmd, payload: cmd == self.Environment.InstallBaseMod)
+
+    def installMod(self, modHash: str):
+        Print("installing", mod=modHash)
+        self.progress.reset()
+
+        self.controller.getModConflict(modHash)
+        payload = self.wait(lambda cmd, payload: (self.isNotification(payload, self.NotificationType.ModConflict, modHash) or
+                                                  self.isNotification(payload, self.NotificationType.ModConflictNotFound, modHash)))
+
+        if payload.notificationType == self.NotificationType.ModConflict:
+            Print("conflict", mod=modHash, conflicts=list(payload.args[1]))
+            if not self.force:
+                raise CliError(f"Mod '{modHash}' conflicts with installed mods, use --force to install anyway")
+
+        self.progress.reset()
+        self.controller.installMod(modHash)
+        self.wait(lambda cmd, payload: self.isNotification(payload, self.NotificationType.InstallingModFinished, modHash))
+
+        Print("installed", mod=modHash, **self.progress.snapshot())
+
+    def uninstallMod(self, modHash: str):
+        Print("uninstalling", mod=modHash)
+        self.progress.reset()
+
+        self.controller.uninstallMod(modHash)
+        self.wait(lambda cmd, payload: self.isNotification(payload, self.NotificationType.UninstallingModFinished, modHash))
+
+        Print("uninstalled", mod=modHash, **self.progress.snapshot())
+
+    def printMod(self, modData: dict):
+        Print("mod",
+              hash=modData.get("hash", ""),
+              name=modData.get("name", ""),
+              author=modData.get("author", ""),
+              version=modData.get("version", ""),
+              gameVersion=modData.get("gameVersion", ""),
+              installed=modData.get("installed", False),
+              modFileExist=modData.get("modFileExist", False),
+              modPath=modData.get("modPath", ""))
+
+    def run(self, command: str, targets: list):
+        if command == Commands.INSTALL:
+            targets = [self.importMod(target) if os.path.isfile(target) else target for target in targets]
+            self.loadMods()
+            self.installBaseMod()
+            for target in targets:
+                self.installMod(self.findMod(target)["hash"])
+
+        elif command == Commands.UNINSTALL:
+            self.loadMods()
+            for target in targets:
+                self.uninstallMod(self.findMod(target)["hash"])
+
+        elif command == Commands.REINSTALL_ALL:
+            self.loadMods()
+            self.installBaseMod()
+            for modData in list(self.mods.values()):
+                if modData.get("installed", False) and modData.get("modFileExist", False):
+                    self.uninstallMod(modData["hash"])
+                    self.installMod(modData["hash"])
+
+        elif command == Commands.LIST:
+            self.loadMods()
+            for modData in self.mods.values():
+                self.printMod(modData)
+
+        elif command == Commands.STATUS:
+            self.loadMods()
+            Print("status",
+                  version=VERSION,
+                  coreVersion=self.core.CORE_VERSION,
+                  modsPath=self.modsPath,
+                  mods=len(self.mods),
+                  installed=sum(1 for modData in self.mods.values() if modData.get("installed", False)),
+                  missingFiles=sum(1 for modData in self.mods.values() if not modData.get("modFileExist", False)))
+
+
+def RunCli(argv, modsPath: str, launchDir: str) -> int:
+    """Relative paths in `argv` are resolved against `launchDir` (working directory of the caller)"""
+    parser = argparse.ArgumentParser(prog="run.py --cli")
+    parser.add_argument("--mods", dest="modsPath", default=modsPath, help="mods folder")
+    parser.add_argument("--force", action="store_true", help="install mods even if they conflict")
+    parser.add_argument("--timeout", type=float, metavar="SECONDS",
+                        help="stop waiting for the core after SECONDS and exit with code 3")
+    parser.add_argument("command", choices=[Commands.INSTALL, Commands.UNINSTALL, Commands.LIST,
+                                            Commands.REINSTALL_ALL, Commands.STATUS])
+    parser.add_argument("targets", nargs="*", metavar="HASH|PATH")
+    args = parser.parse_args(argv)
+
+    if args.command in (Commands.INSTALL, Commands.UNINSTALL) and not args.targets:
+        parser.error(f"'{args.command}' requires at least one mod hash or path")
+
+    targets = []
+    for target in args.targets:
+        path = os.path.join(launchDir, target)
+        targets.append(path if os.path.exists(path) else target)
+
+    from main import KillChildren
+
+    try:
+        cli = Cli(os.path.join(launchDir, args.modsPath), args.force, timeout=args.timeout)
+        cli.run(args.command, targets)
+    except CliTimeout as e:
+        Print("error", message=str(e))
+        return 3
+    except CliError as e:
+        Print("error", message=str(e))
+        return 1
+    except Exception as e:
+        traceback.print_exc()
+        Print("error", message=f"{type(e).__name__}: {e}")
+        return 1
+    finally:
+        # Core process must not outlive the command, it would keep the interpreter from exiting
+        KillChildren()
+
+    return 2 if cli.errors else 0
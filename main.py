@@ -1,49 +1,66 @@
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'BhModLoaderCore')))
+
+from ui.utils.diagnostics import Diagnostics
+Diagnostics.init(sys.argv)
+
 import time
-import py7zr
-import zipfile
 import traceback
 import threading
 import webbrowser
-import requests
 import subprocess
+import collections
 import multiprocessing
 
-# (https://stackoverflow.com/questions/9144724/unknown-encoding-idna-in-python-requests)
-import encodings.idna
-
-from typing import List
+from typing import List, Optional
 
+# Core (and JPype with it) is loaded by LoadCore, on the controller thread
 JAVA_FOUND = False
-try:
-    import core
-    from core import NotificationType, Notification, Environment, CORE_VERSION
+core = NotificationType = Notification = Environment = CORE_VERSION = None
+
+
+def LoadCore() -> bool:
+    global core, NotificationType, Notification, Environment, CORE_VERSION, JAVA_FOUND
 
-    # [FIXED] The original line was 'import core.core.ffdec'.
-    # This was causing a ModuleNotFoundError because the program was looking for a folder named 'core' inside another 'core' folder.
-    # The correct path is simply 'core.ffdec'.
-    import core.ffdec
+    try:
+        import core
+        from core import NotificationType, Notification, Environment, CORE_VERSION
 
-    JAVA_FOUND = True
-except ImportError as e:
-    NotificationType = Notification = Environment = CORE_VERSION = None
+        # [FIXED] The original line was 'import core.core.ffdec'.
+        # This was causing a ModuleNotFoundError because the program was looking for a folder named 'core' inside another 'core' folder.
+        # The correct path is simply 'core.ffdec'.
+        import core.ffdec
 
-    if hasattr(e, 'msg') and e.msg == "Java not found!":
-        JAVA_FOUND = False
-    else:
-        # The original ModuleNotFoundError would cause the program to come here.
-        # By not setting JAVA_FOUND, it would crash later with a NameError.
-        # Now that the import is fixed, this part of the code should not be reached
-        # unless there is a different, unexpected import error.
-        sys.excepthook(*sys.exc_info())
+        JAVA_FOUND = True
+    except ImportError as e:
+        NotificationType = Notification = Environment = CORE_VERSION = None
+
+        if hasattr(e, 'msg') and e.msg == "Java not found!":
+            JAVA_FOUND = False
+        else:
+            # The original ModuleNotFoundError would cause the program to come here.
+            # By not setting JAVA_FOUND, it would crash later with a NameError.
+            # Now that the import is fixed, this part of the code should not be reached
+            # unless there is a different, unexpected import error.
+            sys.excepthook(*sys.exc_info())
+
+    return JAVA_FOUND
 
 
 SUPPORT_URL = "https://www.patreon.com/bhmodloader"
 
 PROGRAM_NAME = "Brawlhalla ModLoader"
 
+# Max time of gui thread spent on core data per wakeup (seconds)
+CONTROLLER_DRAIN_BUDGET = 0.008
+
+# Max number of mods imported (downloaded, extracted, copied) at the same time
+IMPORT_WORKERS = 3
+
+# Max size of downloaded archives kept for reinstalls
+DOWNLOAD_CACHE_SIZE = 2 * 1024 * 1024 * 1024
+
 
 def InitWindowSetText(text):
     if getattr(sys, "frozen", False):
@@ -64,12 +81,17 @@ def InitWindowClose():
             pass
 
 
-def TerminateApp(exitId=0):
+def KillChildren():
+    """Kill the core processes"""
     for proc in multiprocessing.active_children():
         try:
             proc.kill()
         except:
             pass
+
+
+def TerminateApp(exitId=0):
+    KillChildren()
     # Don't use os.kill as it causes invalid handle errors when Qt is cleaning up
     # Instead, just let sys.exit do its job
     sys.exit(exitId)
@@ -159,6 +181,11 @@ if __name__ == "__main__":
     from ui.utils.version import GetLatest, GITHUB, REPO, VERSION, GIT_VERSION, PRERELEASE, GAMEBANANA
     from ui.utils.textformater import TextFormatter
     from ui.utils.mainthread import QExecMainThread
+    from ui.utils.poll import PollData
+    from ui.utils.files import FreeFileName, CopyFile
+    from ui.utils.importjobs import ImportJobManager, ImportJob, ImportJobState, ImportCancelled
+    from ui.utils.download import Downloader, DownloadCancelled
+    from ui.utils.downloadcache import DownloadCache
 
     import ui.ui_sources.translate as translate
 
@@ -172,6 +199,8 @@ if __name__ == "__main__":
         app = None
 
         def __init__(self):
+            Diagnostics.begin("ModLoader.__init__")
+
             super().__init__()
             self.ui = Window()
             self.ui.setupUi(self)
@@ -211,238 +240,276 @@ if __name__ == "__main__":
 
             self.setForeground()
 
+            # Dropped files and urls are imported by a bounded pool of workers
+            self.importJobs = ImportJobManager(IMPORT_WORKERS,
+                                               onUpdate=self.onImportJobUpdate,
+                                               onIdle=self.onImportJobsFinished)
+            self.importNames = set()
+            self.importNamesLock = threading.Lock()
+            # Parallel downloads share keep-alive connections
+            self.downloader = Downloader(poolSize=IMPORT_WORKERS)
+            self.downloadCache = DownloadCache(os.path.join(os.getcwd(), "download_cache"), DOWNLOAD_CACHE_SIZE)
+            # Partial downloads left by failed or cancelled imports
+            self.downloadCache.prune()
+
             self.controller = None
-            if JAVA_FOUND:
-                threading.Thread(target=self.runController).start()
+            self.controllerData = collections.deque()
+            self.controllerHandlerQueued = threading.Event()
+            self.controllerDrainBudget = CONTROLLER_DRAIN_BUDGET
+            threading.Thread(target=self.runController).start()
 
-                # Get core events
-                self.controllerGetterTimer = QTimer()
-                self.controllerGetterTimer.timeout.connect(self.controllerHandler)
-                self.controllerGetterTimer.start(10)
-            else:
-                message = ("Java not found!\n\nRecommended java: "
-                           "<url=\"https://libericajdk.ru/pages/downloads/#/java-8-lts\">"
-                           "https://libericajdk.ru/pages/downloads/#/java-8-lts</url>")
-                self.showError("Fatal Error:", TextFormatter.format(message, 11), terminate=True)
+            # Get core events
+            threading.Thread(target=self.controllerListener, daemon=True).start()
 
             InitWindowClose()
             self.__class__.app = self
 
+            Diagnostics.end("ModLoader.__init__")
+
         def runController(self):
+            self.loading.setText("Loading ModLoader Core")
+
+            with Diagnostics.phase("LoadCore"):
+                coreLoaded = LoadCore()
+
+            if not coreLoaded:
+                message = ("Java not found!\n\nRecommended java: "
+                           "<url=\"https://libericajdk.ru/pages/downloads/#/java-8-lts\">"
+                           "https://libericajdk.ru/pages/downloads/#/java-8-lts</url>")
+                self.showError("Fatal Error:", TextFormatter.format(message, 11), terminate=True)
+                return
+
             try:
-                self.loading.setText("Loading ModLoader Core")
+                self.initControllerHandlers()
 
-                self.controller = core.Controller()
+                with Diagnostics.phase("core.Controller()"):
+                    self.controller = core.Controller()
+
+                # Phases end when the core answers (see handlers)
+                Diagnostics.begin("setModsPath")
                 self.controller.setModsPath(self.modsPath)
+                Diagnostics.begin("reloadMods")
                 self.controller.reloadMods()
+                Diagnostics.begin("getModsData")
                 self.controller.getModsData()
+                Diagnostics.begin("installBaseMod")
                 self.controller.installBaseMod(f"{PROGRAM_NAME}: {VERSION}")
             except Exception:
                 traceback.print_exc()
 
-        def controllerHandler(self):
-            if self.controller is None:
-                return
+        def controllerListener(self):
+            # Core data is read on this thread, the gui thread is woken only when there is some
+            for data in PollData(lambda: None if self.controller is None else self.controller.getData()):
+                self.controllerData.append(data)
 
-            data = self.controller.getData()
-            if data is None:
-                return
+                # Wake up gui thread only once per batch of data
+                if not self.controllerHandlerQueued.is_set():
+                    self.controllerHandlerQueued.set()
+                    self.controllerHandler()
 
-            cmd = data[0]
+        @QExecMainThread
+        def controllerHandler(self):
+            self.controllerHandlerQueued.clear()
 
-            if cmd == Environment.Notification:
-                notification: core.notifications.Notification = data[1]
-                ntype = notification.notificationType
+            deadline = time.perf_counter() + self.controllerDrainBudget
+            while self.controllerData:
+                self.handleControllerData(self.controllerData.popleft())
 
-                if ntype == NotificationType.LoadingMod:
-                    modPath = notification.args[0]
-                    self.loading.setText(f"Loading mod '{modPath or 'from cache'}'")
+                if time.perf_counter() >= deadline:
+                    break
 
-                elif ntype == NotificationType.ModElementsCount:
-                    modHash, count = notification.args
-                    self.progressDialog.setMaximum(count)
+            # Let qt repaint and handle user input before the rest of the backlog
+            if self.controllerData and not self.controllerHandlerQueued.is_set():
+                self.controllerHandlerQueued.set()
+                QTimer.singleShot(0, self.controllerHandler)
+
+        def initControllerHandlers(self):
+            self.environmentHandlers = {
+                Environment.Notification: self.onNotification,
+                Environment.ReloadMods: self.onReloadMods,
+                Environment.GetModsData: self.onGetModsData,
+                Environment.GetModConflict: self.onGetModConflict,
+                Environment.InstallMod: self.onInstallMod,
+                Environment.UninstallMod: self.onUninstallMod,
+                Environment.DecompileMod: self.onDecompileMod,
+                Environment.DeleteMod: lambda data: None,
+                Environment.SetModsPath: lambda data: Diagnostics.end("setModsPath"),
+                Environment.InstallBaseMod: self.onInstallBaseMod,
+            }
+
+            self.notificationHandlers = {
+                NotificationType.LoadingMod: self.onLoadingMod,
+                NotificationType.ModElementsCount: self.onModElementsCount,
 
                 # Check conflicts
-                elif ntype == NotificationType.ModConflictSearchInSwf:
-                    modHash, swfName = notification.args
-                    self.progressDialog.setContent(f"Searching in: {swfName}")
-                    self.progressDialog.addValue()
-                elif ntype == NotificationType.ModConflictNotFound:
-                    modHash, = notification.args
-                    self.progressDialog.setValue(0)
-                    self.controller.installMod(modHash)
-                elif ntype == NotificationType.ModConflict:
-                    modHash, modConflictHashes = notification.args
-                    self.acceptDialog.setTitle("Conflict mods!")
-                    content = "Mods:"
-
-                    for modConflictHash in modConflictHashes:
-                        if modConflictHash in self.mods.mods:
-                            mod = self.mods.mods[modConflictHash]
-                            content += f"\n- {mod.name}"
-
-                        else:
-                            content += f"\n- UNKNOWN MOD: {modConflictHash}"
-                            print("ERROR Один из установленных модов не найден в модлодере!")
-
-                    self.acceptDialog.setContent(content)
-                    self.acceptDialog.setAccept(lambda: [self.acceptDialog.hide(), self.controller.installMod(modHash)])
-                    self.acceptDialog.setCancel(self.acceptDialog.hide)
-
-                    self.progressDialog.hide()
-                    self.acceptDialog.show()
-
+                NotificationType.ModConflictSearchInSwf: self.onModConflictSearchInSwf,
+                NotificationType.ModConflictNotFound: self.onModConflictNotFound,
+                NotificationType.ModConflict: self.onModConflict,
 
                 # Installing
-                elif ntype == NotificationType.InstallingModSwf:
-                    modHash, swfName = notification.args
-                    self.progressDialog.setContent(f"Open game file: {swfName}")
-                elif ntype == NotificationType.InstallingModSwfSprite:
-                    modHash, sprite = notification.args
-                    self.progressDialog.setContent(f"Installing sprite: {sprite}")
-                    self.progressDialog.addValue()
-                elif ntype == NotificationType.InstallingModSwfSound:
-                    modHash, sound = notification.args
-                    self.progressDialog.setContent(f"Installing sound: {sound}")
-                    self.progressDialog.addValue()
-                elif ntype == NotificationType.InstallingModFile:
-                    modHash, fileName = notification.args
-                    self.progressDialog.setContent(f"Installing file: {fileName}")
-                    self.progressDialog.addValue()
-                elif ntype == NotificationType.InstallingModFileCache:
-                    modHash, fileName = notification.args
-                    self.progressDialog.setContent(fileName)
-                    self.progressDialog.addValue()
-                elif ntype == NotificationType.InstallingModFinished:
-                    modHash = notification.args[0]
-                    modClass = self.mods.mods[modHash]
-                    modClass.installed = True
-                    self.mods.updateData()
-                    self.mods.selectedModButton.updateData()
-                    self.progressDialog.hide()
-
-                    self.showErrorNotifications()
+                NotificationType.InstallingModSwf:
+                    lambda n: self.progressDialog.setContent(f"Open game file: {n.args[1]}"),
+                NotificationType.InstallingModSwfSprite: lambda n: self.onProgress(f"Installing sprite: {n.args[1]}"),
+                NotificationType.InstallingModSwfSound: lambda n: self.onProgress(f"Installing sound: {n.args[1]}"),
+                NotificationType.InstallingModFile: lambda n: self.onProgress(f"Installing file: {n.args[1]}"),
+                NotificationType.InstallingModFileCache: lambda n: self.onProgress(n.args[1]),
+                NotificationType.InstallingModFinished: lambda n: self.onModFinished(n.args[0], True),
 
                 # Uninstalling
-                elif ntype == NotificationType.UninstallingModSwf:
-                    modHash, swfName = notification.args
-                    self.progressDialog.setContent(swfName)
-                elif ntype == NotificationType.UninstallingModSwfSprite:
-                    modHash, sprite = notification.args
-                    self.progressDialog.setContent(sprite)
-                    self.progressDialog.addValue()
-                elif ntype == NotificationType.UninstallingModSwfSound:
-                    modHash, sprite = notification.args
-                    self.progressDialog.setContent(sprite)
-                    self.progressDialog.addValue()
-                elif ntype == NotificationType.UninstallingModFile:
-                    modHash, fileName = notification.args
-                    self.progressDialog.setContent(fileName)
-                    self.progressDialog.addValue()
-                elif ntype == NotificationType.UninstallingModFinished:
-                    modHash = notification.args[0]
-                    modClass = self.mods.mods[modHash]
-                    modClass.installed = False
-                    self.mods.updateData()
-                    self.mods.selectedModButton.updateData()
-
-                    self.progressDialog.hide()
-                    self.showErrorNotifications()
+                NotificationType.UninstallingModSwf: lambda n: self.progressDialog.setContent(n.args[1]),
+                NotificationType.UninstallingModSwfSprite: lambda n: self.onProgress(n.args[1]),
+                NotificationType.UninstallingModSwfSound: lambda n: self.onProgress(n.args[1]),
+                NotificationType.UninstallingModFile: lambda n: self.onProgress(n.args[1]),
+                NotificationType.UninstallingModFinished: lambda n: self.onModFinished(n.args[0], False),
 
                 # Decompiling
-                elif ntype == NotificationType.DecompilingMod:
-                    modHash, = notification.args
-                    self.progressDialog.setContent("Decompiling...")
-
-                elif ntype == NotificationType.DecompilingModFinished:
-                    self.progressDialog.hide()
-                    self.showError("Decompile Finished", "The mod has been decompiled successfully.")
-
-                elif ntype in [NotificationType.CompileModSourcesSpriteHasNoSymbolclass,  # Compiler
-                               NotificationType.CompileModSourcesSpriteEmpty,
-                               NotificationType.CompileModSourcesSpriteNotFoundInFolder,
-                               NotificationType.CompileModSourcesUnsupportedCategory,
-                               NotificationType.CompileModSourcesUnknownFile,
-                               NotificationType.CompileModSourcesSaveError,
-                               NotificationType.LoadingModIsEmpty,  # Loader
-                               NotificationType.InstallingModNotFoundFileElement,  # Installer
-                               NotificationType.InstallingModNotFoundGameSwf,
-                               NotificationType.InstallingModSwfScriptError,
-                               NotificationType.InstallingModSwfSoundSymbolclassNotExist,
-                               NotificationType.InstallingModSoundNotExist,
-                               NotificationType.InstallingModSwfSpriteSymbolclassNotExist,
-                               NotificationType.InstallingModSpriteNotExist,
-                               NotificationType.UninstallingModSwfOriginalElementNotFound,  # Uninstaller
-                               NotificationType.UninstallingModSwfElementNotFound]:
-                    self.errors.append(notification)
-
-            elif cmd == Environment.ReloadMods:
-                self.mods.removeAllMods()
-
-            elif cmd == Environment.GetModsData:
-                for modData in data[1]:
-                    self.mods.addMod(gameVersion=modData.get("gameVersion", ""),
-                                      name=modData.get("name", ""),
-                                      author=modData.get("author", ""),
-                                      version=modData.get("version", ""),
-                                      description=modData.get("description", ""),
-                                      tags=modData.get("tags", []),
-                                      previewsPaths=modData.get("previewsPaths", []),
-                                      hash=modData.get("hash", ""),
-                                      platform=modData.get("platform", ""),
-                                      installed=modData.get("installed", False),
-                                      currentVersion=modData.get("currentVersion", False),
-                                      modFileExist=modData.get("modFileExist", False),
-                                      modPath=modData.get("modPath", ""),
-                                      modCachePath=modData.get("modCachePath", ""),
-                                      dateAdded=modData.get("dateAdded", 0.0))
-
-                self.setModsScreen()
-                self.showErrorNotifications()
-
-            elif cmd == Environment.GetModConflict:
-                searching, modHash = data[1]
-                if searching:
-                    modClass = self.mods.mods[modHash]
-                    self.progressDialog.setTitle(f"Searching conflicts '{modClass.name}'...")
-                    self.progressDialog.setContent("Searching...")
-                    self.progressDialog.show()
-
-            elif cmd == Environment.InstallMod:
-                installing, modHash = data[1]
-                if installing:
-                    modClass = self.mods.mods[modHash]
-                    self.progressDialog.setTitle(f"Installing mod '{modClass.name}'...")
-                    self.progressDialog.setContent("Loading mod...")
-                    self.progressDialog.show()
-
-            elif cmd == Environment.UninstallMod:
-                uninstalling, modHash = data[1]
-                if uninstalling:
-                    modClass = self.mods.mods[modHash]
-                    self.progressDialog.setTitle(f"Uninstalling mod '{modClass.name}'...")
-                    self.progressDialog.setContent("")
-                    self.progressDialog.show()
-
-            elif cmd == Environment.DecompileMod:
-                decompiling, modHash = data[1]
-                if decompiling:
-                    modClass = self.mods.mods[modHash]
-                    self.progressDialog.setTitle(f"Decompiling mod '{modClass.name}'...")
-                    self.progressDialog.setContent("Starting...")
-                    self.progressDialog.show()
-
-            elif cmd == Environment.DeleteMod:
-                pass
+                NotificationType.DecompilingMod: lambda n: self.progressDialog.setContent("Decompiling..."),
+                NotificationType.DecompilingModFinished: self.onDecompilingModFinished,
+            }
+
+            for ntype in [NotificationType.CompileModSourcesSpriteHasNoSymbolclass,  # Compiler
+                          NotificationType.CompileModSourcesSpriteEmpty,
+                          NotificationType.CompileModSourcesSpriteNotFoundInFolder,
+                          NotificationType.CompileModSourcesUnsupportedCategory,
+                          NotificationType.CompileModSourcesUnknownFile,
+                          NotificationType.CompileModSourcesSaveError,
+                          NotificationType.LoadingModIsEmpty,  # Loader
+                          NotificationType.InstallingModNotFoundFileElement,  # Installer
+                          NotificationType.InstallingModNotFoundGameSwf,
+                          NotificationType.InstallingModSwfScriptError,
+                          NotificationType.InstallingModSwfSoundSymbolclassNotExist,
+                          NotificationType.InstallingModSoundNotExist,
+                          NotificationType.InstallingModSwfSpriteSymbolclassNotExist,
+                          NotificationType.InstallingModSpriteNotExist,
+                          NotificationType.UninstallingModSwfOriginalElementNotFound,  # Uninstaller
+                          NotificationType.UninstallingModSwfElementNotFound]:
+                self.notificationHandlers[ntype] = self.errors.append
+
+        def handleControllerData(self, data):
+            handler = self.environmentHandlers.get(data[0], None)
+
+            if handler is None:
+                print(f"Controller <- {str(data)}\n", end="")
+            else:
+                handler(data)
 
-            elif cmd == Environment.SetModsPath:
-                pass
+        def onNotification(self, data):
+            notification: core.notifications.Notification = data[1]
+            handler = self.notificationHandlers.get(notification.notificationType, None)
 
-            elif cmd == Environment.InstallBaseMod:
-                self.loading.setText("Installing base mod...")
+            if handler is not None:
+                handler(notification)
 
-            else:
-                print(f"Controller <- {str(data)}\n", end="")
+        def onLoadingMod(self, notification):
+            modPath = notification.args[0]
+
+            Diagnostics.end("LoadingMod")
+            Diagnostics.begin("LoadingMod", modPath=modPath or "from cache")
+            self.loading.setText(f"Loading mod '{modPath or 'from cache'}'")
+
+        def onModElementsCount(self, notification):
+            modHash, count = notification.args
+            self.progressDialog.setMaximum(count)
+
+        def onModConflictSearchInSwf(self, notification):
+            modHash, swfName = notification.args
+            self.onProgress(f"Searching in: {swfName}")
+
+        def onModConflictNotFound(self, notification):
+            modHash, = notification.args
+            self.progressDialog.setValue(0)
+            self.controller.installMod(modHash)
+
+        def onModConflict(self, notification):
+            modHash, modConflictHashes = notification.args
+            self.acceptDialog.setTitle("Conflict mods!")
+            content = "Mods:"
+
+            for modConflictHash in modConflictHashes:
+                if modConflictHash in self.mods.mods:
+                    mod = self.mods.mods[modConflictHash]
+                    content += f"\n- {mod.name}"
+
+                else:
+                    content += f"\n- UNKNOWN MOD: {modConflictHash}"
+                    print("ERROR Один из установленных модов не найден в модлодере!")
+
+            self.acceptDialog.setContent(content)
+            self.acceptDialog.setAccept(lambda: [self.acceptDialog.hide(), self.controller.installMod(modHash)])
+            self.acceptDialog.setCancel(self.acceptDialog.hide)
+
+            self.progressDialog.hide()
+            self.acceptDialog.show()
+
+        def onProgress(self, content):
+            self.progressDialog.addProgress(content)
+
+        def onModFinished(self, modHash, installed):
+            modClass = self.mods.mods[modHash]
+            modClass.installed = installed
+            self.mods.updateData()
+            self.mods.updateMod(modClass)
+
+            self.progressDialog.hide()
+            self.showErrorNotifications()
+
+        def onDecompilingModFinished(self, notification):
+            self.progressDialog.hide()
+            self.showError("Decompile Finished", "The mod has been decompiled successfully.")
+
+        def onReloadMods(self, data):
+            Diagnostics.end("reloadMods")
+            self.mods.removeAllMods()
+
+        def onGetModsData(self, data):
+            Diagnostics.end("LoadingMod")
+            Diagnostics.end("getModsData", mods=len(data[1]))
+
+            Diagnostics.begin("Mods.addMods")
+            self.mods.addMods(data[1])
+            Diagnostics.end("Mods.addMods", mods=len(data[1]))
+
+            # All mods are loaded, cached descriptions of mods that are gone are removed
+            self.mods.descriptions.prune(modClass.rawDescription for modClass in self.mods.mods.values())
+
+            self.setModsScreen()
+            self.showErrorNotifications()
+
+        def onGetModConflict(self, data):
+            searching, modHash = data[1]
+            if searching:
+                modClass = self.mods.mods[modHash]
+                self.progressDialog.setTitle(f"Searching conflicts '{modClass.name}'...")
+                self.progressDialog.setContent("Searching...")
+                self.progressDialog.show()
+
+        def onInstallMod(self, data):
+            installing, modHash = data[1]
+            if installing:
+                modClass = self.mods.mods[modHash]
+                self.progressDialog.setTitle(f"Installing mod '{modClass.name}'...")
+                self.progressDialog.setContent("Loading mod...")
+                self.progressDialog.show()
+
+        def onUninstallMod(self, data):
+            uninstalling, modHash = data[1]
+            if uninstalling:
+                modClass = self.mods.mods[modHash]
+                self.progressDialog.setTitle(f"Uninstalling mod '{modClass.name}'...")
+                self.progressDialog.setContent("")
+                self.progressDialog.show()
+
+        def onDecompileMod(self, data):
+            decompiling, modHash = data[1]
+            if decompiling:
+                modClass = self.mods.mods[modHash]
+                self.progressDialog.setTitle(f"Decompiling mod '{modClass.name}'...")
+                self.progressDialog.setContent("Starting...")
+                self.progressDialog.show()
+
+        def onInstallBaseMod(self, data):
+            Diagnostics.end("installBaseMod")
+            self.loading.setText("Installing base mod...")
 
         def showErrorNotifications(self):
             if self.errors:
@@ -534,10 +601,13 @@ if __name__ == "__main__":
             self.loading.setText("Loading mods sources...")
 
         def setModsScreen(self):
-            ClearFrame(self.ui.mainFrame)
+            with Diagnostics.phase("setModsScreen"):
+                ClearFrame(self.ui.mainFrame)
 
-            AddToFrame(self.ui.mainFrame, self.header)
-            AddToFrame(self.ui.mainFrame, self.mods)
+                AddToFrame(self.ui.mainFrame, self.header)
+                AddToFrame(self.ui.mainFrame, self.mods)
+
+            Diagnostics.saveTimeline()
 
         def showInformation(self):
             self.buttonsDialog.setTitle("About")
@@ -558,32 +628,32 @@ if __name__ == "__main__":
             self.buttonsDialog.show()
 
         def installMod(self):
-            if self.mods.selectedModButton is not None:
-                modClass = self.mods.selectedModButton.modClass
+            if self.mods.selectedMod is not None:
+                modClass = self.mods.selectedMod
                 self.controller.getModConflict(modClass.hash)
 
         def uninstallMod(self):
-            if self.mods.selectedModButton is not None:
-                modClass = self.mods.selectedModButton.modClass
+            if self.mods.selectedMod is not None:
+                modClass = self.mods.selectedMod
                 self.controller.uninstallMod(modClass.hash)
 
         def reinstallMod(self, mod_hash=None):
             if mod_hash:
                 self.controller.uninstallMod(mod_hash)
                 self.controller.getModConflict(mod_hash)
-            elif self.mods.selectedModButton is not None:
-                modClass = self.mods.selectedModButton.modClass
+            elif self.mods.selectedMod is not None:
+                modClass = self.mods.selectedMod
                 self.controller.uninstallMod(modClass.hash)
                 self.controller.getModConflict(modClass.hash)
 
         def decompileMod(self):
-            if self.mods.selectedModButton is not None:
-                modClass = self.mods.selectedModButton.modClass
+            if self.mods.selectedMod is not None:
+                modClass = self.mods.selectedMod
                 self.controller.decompileMod(modClass.hash)
 
         def deleteMod(self):
-            if self.mods.selectedModButton is not None:
-                modClass = self.mods.selectedModButton.modClass
+            if self.mods.selectedMod is not None:
+                modClass = self.mods.selectedMod
 
                 self.buttonsDialog.deleteButtons()
                 self.buttonsDialog.setTitle(f"Delete mod '{modClass.name}'")
@@ -601,14 +671,16 @@ if __name__ == "__main__":
         def reloadMods(self):
             self.setLoadingScreen()
             #self.mods.removeAllMods()
+            Diagnostics.begin("reloadMods")
             self.controller.reloadMods()
+            Diagnostics.begin("getModsData")
             self.controller.getModsData()
 
         def openModsFolder(self):
             os.startfile(self.modsPath)
 
         def _deleteMod(self):
-            modClass = self.mods.selectedModButton.modClass
+            modClass = self.mods.selectedMod
             modClass.modFileExist = False
             self.controller.deleteMod(modClass.hash)
             self.reloadMods()
@@ -664,35 +736,88 @@ if __name__ == "__main__":
         queueFileSignal = Signal()
 
         def queueFile(self):
-            for file in self.importQueue.iterFile():
-                self.fileImport(file)
+            self.importFiles(list(self.importQueue.iterFile()))
 
         def fileImport(self, filePath: str):
-            self.setForeground()
+            self.importFiles([filePath])
 
-            if os.path.abspath(filePath).startswith(os.path.abspath(self.modsPath)):
-                return
+        def importFiles(self, filePaths: List[str]):
+            modsPath = os.path.abspath(self.modsPath)
+            filePaths = [filePath for filePath in filePaths if not os.path.abspath(filePath).startswith(modsPath)]
+
+            if filePaths:
+                self.setForeground()
+
+            self.importJobs.submitAll((os.path.split(filePath)[1],
+                                       lambda job, filePath=filePath: self._importFile(job, filePath))
+                                      for filePath in filePaths)
 
+        def _importFile(self, job: ImportJob, filePath: str):
+            """Runs on an import worker, GUI is only touched through QExecMainThread methods"""
             fileName = os.path.split(filePath)[1]
-            fileNameSplit = os.path.splitext(fileName)
 
-            if fileNameSplit[1] == ".zip":
+            if os.path.splitext(fileName)[1] == ".zip":
+                import zipfile
+
+                job.setState(ImportJobState.EXTRACTING)
                 with zipfile.ZipFile(filePath) as modZip:
-                    for file in modZip.namelist():
-                        if file.endswith((".bmod", ".wem", ".bnk", ".bin")):
-                            modZip.extract(file, self.modsPath)
+                    self._extractMembers(job, modZip.namelist(), lambda file: modZip.extract(file, self.modsPath))
             else:
-                if os.path.exists(os.path.join(self.modsPath, fileName)):
-                    i = 1
-                    while os.path.exists(os.path.join(self.modsPath, f"{fileNameSplit[0]} ({i}){fileNameSplit[1]}")):
-                        i += 1
-                    fileName = f"{fileNameSplit[0]} ({i}){fileNameSplit[1]}"
+                # Names of files still being copied by other jobs are taken too
+                with self.importNamesLock:
+                    fileName = FreeFileName(self.modsPath, fileName, self.importNames)
+                    self.importNames.add(fileName)
 
-                with open(filePath, "rb") as outsideMod:
-                    with open(os.path.join(self.modsPath, fileName), "wb") as insideMod:
-                        insideMod.write(outsideMod.read())
+                try:
+                    job.setState(ImportJobState.COPYING, fileName)
+                    CopyFile(filePath, os.path.join(self.modsPath, fileName), job.setProgress)
+                finally:
+                    with self.importNamesLock:
+                        self.importNames.discard(fileName)
 
-            self.reloadMods()
+        @staticmethod
+        def _modFiles(names: List[str]) -> List[str]:
+            return [file for file in names if file.endswith((".bmod", ".wem", ".bnk", ".bin"))]
+
+        def _extractMembers(self, job: ImportJob, names: List[str], extract):
+            files = self._modFiles(names)
+
+            for n, file in enumerate(files):
+                job.setProgress(n, len(files), f"Extract: '{file}'")
+                extract(file)
+
+        @QExecMainThread
+        def onImportJobUpdate(self, job: dict):
+            if job["state"] == ImportJobState.FAILED:
+                self.showError("Import error:", f"{job['name']}\n\n{job['error']}")
+                return
+
+            if job["state"] in ImportJobState.FINISHED:
+                return
+
+            title = {ImportJobState.QUEUED: "Import mod",
+                     ImportJobState.DOWNLOADING: "Download mod",
+                     ImportJobState.EXTRACTING: "Extract mod",
+                     ImportJobState.COPYING: "Import mod"}[job["state"]]
+
+            active = len(self.importJobs.active())
+            if active > 1:
+                title = f"{title} ({active} in queue)"
+
+            self.progressDialog.setTitle(title)
+            self.progressDialog.setMaximum(job["maximum"] or 100)
+            self.progressDialog.setValue(job["value"])
+            self.progressDialog.setContent(job["content"] or job["name"])
+            self.progressDialog.setCancel(self.importJobs.cancelAll)
+            self.progressDialog.show()
+
+        @QExecMainThread
+        def onImportJobsFinished(self, jobs: List[dict]):
+            self.progressDialog.setCancel(None)
+            self.progressDialog.hide()
+
+            if any(job["state"] == ImportJobState.DONE for job in jobs):
+                self.reloadMods()
 
         queueUrlSignal = Signal()
 
@@ -711,69 +836,109 @@ if __name__ == "__main__":
                 zipUrl = ""
                 return
 
-            archivePath = os.path.join(self.modsPath, "_mod.archive")
-            self.progressDialog.setMaximum(100)
-            self.progressDialog.setTitle("Download mod")
-            self.progressDialog.setContent("")
-            self.progressDialog.show()
-            QApplication.processEvents()
+            name = f"GameBanana mod {modId}/{dlId}"
+            # Same file is already being imported
+            if any(job.name == name for job in self.importJobs.active()):
+                return
+
+            self.importJobs.submit(name, lambda job: self._urlImport(job, zipUrl, dlId))
+
+        def _urlImport(self, job: ImportJob, zipUrl: str, dlId: str):
+            """Runs on an import worker, GUI is only touched through QExecMainThread methods"""
+            job.setState(ImportJobState.DOWNLOADING)
+            entry = self._cachedArchive(zipUrl, dlId)
+
+            if entry is None:
+                # Every file downloads to its own path, a failed or cancelled download is resumed from it next time
+                partPath = self.downloadCache.partPath(dlId)
+                try:
+                    validators = self.downloader.download(zipUrl, partPath, job.setProgress, job.cancelEvent)
+                except DownloadCancelled:
+                    # Cancelled while waiting to retry
+                    job.checkCancelled()
+                    raise
+                entry = self.downloadCache.put(dlId, zipUrl, partPath, **validators)
+
+            # Archive stays pinned in the cache until it is extracted, other imports can't evict it meanwhile
             try:
-                with requests.get(zipUrl, stream=True) as r:
-                    r.raise_for_status()
-                    with open(archivePath, 'wb') as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            f.write(chunk)
-
-                with open(archivePath, "rb") as file:
-                    _signature = file.read(3)
-                    if _signature.startswith(b"7z"):
-                        with py7zr.SevenZipFile(archivePath) as mod7z:
-                            for file in mod7z.getnames():
-                                if file.endswith((".bmod", ".wem", ".bnk", ".bin")):
-                                    self.progressDialog.setContent(f"Extract: '{file}'")
-                                    QApplication.processEvents()
-                                    mod7z.extract(self.modsPath, [file])
-                    elif _signature.startswith(b"Rar"):
-                        with rarfile.RarFile(archivePath) as modRar:
-                            for file in modRar.namelist():
-                                if file.endswith((".bmod", ".wem", ".bnk", ".bin")):
-                                    self.progressDialog.setContent(f"Extract: '{file}'")
-                                    QApplication.processEvents()
-                                    modRar.extract(file, self.modsPath)
-                    elif _signature.startswith(b"PK"):
-                        with zipfile.ZipFile(archivePath) as modZip:
-                            for file in modZip.namelist():
-                                if file.endswith((".bmod", ".wem", ".bnk", ".bin")):
-                                    self.progressDialog.setContent(f"Extract: '{file}'")
-                                    QApplication.processEvents()
-                                    modZip.extract(file, self.modsPath)
-                self.reloadMods()
-                self.progressDialog.hide()
-            except Exception as e:
-                self.showError("Download error:", str(e))
+                self._extractArchive(job, self.downloadCache.archivePath(entry["sha256"]))
             finally:
-                if os.path.exists(archivePath):
-                    os.remove(archivePath)
+                self.downloadCache.release(entry)
+
+        def _extractArchive(self, job: ImportJob, archivePath: str):
+            job.setState(ImportJobState.EXTRACTING)
+            with open(archivePath, "rb") as file:
+                _signature = file.read(3)
+                if _signature.startswith(b"7z"):
+                    import py7zr
+                    from ui.utils.archives import SevenZipProgress
+
+                    with py7zr.SevenZipFile(archivePath) as mod7z:
+                        files = self._modFiles(mod7z.getnames())
+
+                        def progress(n, file):
+                            try:
+                                job.setProgress(n, len(files), f"Extract: '{file}'")
+                            except ImportCancelled:
+                                # Extraction of the archive can't be stopped midway, job stops after it
+                                pass
+
+                        # Solid archive is decompressed from the start by every extract call, so all files
+                        # are extracted in one call
+                        if files:
+                            mod7z.extract(self.modsPath, files, callback=SevenZipProgress(files, progress))
+                        job.checkCancelled()
+                elif _signature.startswith(b"Rar"):
+                    import rarfile
+
+                    with rarfile.RarFile(archivePath) as modRar:
+                        self._extractMembers(job, modRar.namelist(),
+                                             lambda file: modRar.extract(file, self.modsPath))
+                elif _signature.startswith(b"PK"):
+                    import zipfile
+
+                    with zipfile.ZipFile(archivePath) as modZip:
+                        self._extractMembers(job, modZip.namelist(),
+                                             lambda file: modZip.extract(file, self.modsPath))
+
+        def _cachedArchive(self, zipUrl: str, dlId: str) -> Optional[dict]:
+            """Pinned cache entry of `dlId` if its archive is still current on the server"""
+            entry = self.downloadCache.acquire(dlId)
+            if entry is None:
+                return None
+
+            # Files of a dlId don't change on GameBanana, without validators (or offline) cached file is used
+            if entry["etag"] or entry["lastModified"]:
+                try:
+                    if not self.downloader.notModified(zipUrl, entry["etag"], entry["lastModified"]):
+                        self.downloadCache.release(entry)
+                        return None
+                except Exception:
+                    pass
+
+            self.downloadCache.touch(dlId)
+            return entry
 
     def RunApp():
-        app = QApplication(sys.argv)
-
-        font_db = QFontDatabase()
-        font_db.addApplicationFont(":/fonts/resources/fonts/Exo 2/Exo2-SemiBold.ttf")
-        font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Black.ttf")
-        font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-BlackItalic.ttf")
-        font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Bold.ttf")
-        font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-BoldItalic.ttf")
-        font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Italic.ttf")
-        font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Medium.ttf")
-        font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-MediumItalic.ttf")
-        font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Regular.ttf")
+        with Diagnostics.phase("QApplication"):
+            app = QApplication(sys.argv)
+
+        with Diagnostics.phase("RunApp.fonts"):
+            font_db = QFontDatabase()
+            font_db.addApplicationFont(":/fonts/resources/fonts/Exo 2/Exo2-SemiBold.ttf")
+            font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Black.ttf")
+            font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-BlackItalic.ttf")
+            font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Bold.ttf")
+            font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-BoldItalic.ttf")
+            font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Italic.ttf")
+            font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Medium.ttf")
+            font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-MediumItalic.ttf")
+            font_db.addApplicationFont(":/fonts/resources/fonts/Roboto/Roboto-Regular.ttf")
 
         window = ModLoader()
 
         if len(sys.argv) > 1:
-            for file in sys.argv[1:]:
-                window.fileImport(file)
+            window.importFiles(sys.argv[1:])
 
         window.show()
 
@@ -4,13 +4,16 @@ import sys
 import traceback
 import threading
 import multiprocessing
-import zipfile
 
 from ui.utils.systemdialog import Error
 
 
+LAUNCH_DIR = os.getcwd()
 os.chdir(os.path.dirname(os.path.abspath(sys.argv[0])))
 
+from ui.utils.diagnostics import Diagnostics
+Diagnostics.init(sys.argv)
+
 
 def _bootstrap(self, parent_sentinel=None):
     import itertools
@@ -85,15 +88,26 @@ def handle_exception(exc_type, exc_value, exc_traceback):
         #sys.__excepthook__(exc_type, exc_value, exc_traceback)
 
 
-sys.excepthook = handle_exception
-threading.excepthook = lambda hook: handle_exception(hook.exc_type, hook.exc_value, hook.exc_traceback)
+if "--cli" not in sys.argv:
+    sys.excepthook = handle_exception
+    threading.excepthook = lambda hook: handle_exception(hook.exc_type, hook.exc_value, hook.exc_traceback)
+
 
+if __name__ == "__main__" and "--cli" in sys.argv:
+    # Headless mode, never imports Qt
+    from cli import RunCli
+    exitId = RunCli(sys.argv[sys.argv.index("--cli") + 1:], os.path.join(os.getcwd(), "Mods"), LAUNCH_DIR)
 
-if __name__ == "__main__" and "--multiprocessing-fork" not in sys.argv:
+    from main import TerminateApp
+    TerminateApp(exitId)
+
+elif __name__ == "__main__" and "--multiprocessing-fork" not in sys.argv:
     if len(sys.argv) > 1:
         dest = os.path.join(os.path.dirname(sys.argv[0]), "Mods", os.path.basename(sys.argv[1]))
         os.makedirs(os.path.dirname(dest), exist_ok=True)
         if os.path.splitext(sys.argv[1])[1] == ".zip":
+            import zipfile
+
             with zipfile.ZipFile(os.path.abspath(sys.argv[1]), 'r') as zip_ref:
                 zip_ref.extractall(dest)
         else:
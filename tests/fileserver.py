@@ -0,0 +1,130 @@
+import time
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+class FileServer:
+    """
+    Serves one file on localhost for download tests, with switches for broken servers:
+    `cuts` next responses are cut after `cutAfter` body bytes, `ranges` off ignores Range requests.
+    Every request is recorded as {"headers", "port"} (port of the client connection)
+    """
+
+    def __init__(self, data: bytes, etag: Optional[str] = '"v1"', lastModified: Optional[str] = None,
+                 ranges: bool = True, bytesPerSecond: int = 0):
+        self.data = data
+        self.etag = etag
+        self.lastModified = lastModified
+        self.ranges = ranges
+        self.bytesPerSecond = bytesPerSecond
+
+        self.cutAfter = 0
+        self.cuts = 0
+
+        self.requests: List[dict] = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/mod.zip"
+
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+
+    def __enter__(self) -> "FileServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def cut(self, after: int, times: int = 1):
+        with self._lock:
+            self.cutAfter = after
+            self.cuts = times
+
+    def change(self, data: bytes, etag: str):
+        with self._lock:
+            self.data = data
+            self.etag = etag
+
+    def ports(self) -> set:
+        return {request["port"] for request in self.requests}
+
+    def validator(self) -> List[str]:
+        return [value for value in (self.etag, self.lastModified) if value]
+
+    def handle(self, handler: BaseHTTPRequestHandler):
+        with self._lock:
+            self.requests.append({"headers": dict(handler.headers), "port": handler.client_address[1]})
+            data = self.data
+
+            cutAfter = 0
+            if self.cuts:
+                self.cuts -= 1
+                cutAfter = self.cutAfter
+
+        headers = handler.headers
+        if self.etag and headers.get("If-None-Match") == self.etag:
+            handler.send_response(304)
+            handler.send_header("ETag", self.etag)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        start = 0
+        rangeHeader = headers.get("Range")
+        ifRange = headers.get("If-Range")
+        if self.ranges and rangeHeader and (ifRange is None or ifRange in self.validator()):
+            start = int(rangeHeader[len("bytes="):].split("-")[0])
+            if start >= len(data):
+                handler.send_response(416)
+                handler.send_header("Content-Range", f"bytes */{len(data)}")
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+                return
+
+            handler.send_response(206)
+            handler.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            handler.send_response(200)
+
+        if self.ranges:
+            handler.send_header("Accept-Ranges", "bytes")
+        if self.etag:
+            handler.send_header("ETag", self.etag)
+        if self.lastModified:
+            handler.send_header("Last-Modified", self.lastModified)
+        handler.send_header("Content-Length", str(len(data) - start))
+        handler.end_headers()
+
+        body = memoryview(data)[start:]
+        if cutAfter:
+            body = body[:cutAfter]
+            handler.close_connection = True
+
+        self._write(handler, body)
+
+    def _write(self, handler: BaseHTTPRequestHandler, body: memoryview):
+        if not self.bytesPerSecond:
+            handler.wfile.write(body)
+            return
+
+        # Throttled like a real connection, in 64 KiB writes
+        step = 64 * 1024
+        for offset in range(0, len(body), step):
+            handler.wfile.write(body[offset:offset + step])
+            time.sleep(step / self.bytesPerSecond)
@@ -0,0 +1,41 @@
+import os
+
+from ui.utils.descriptions import DescriptionCache
+from ui.utils.textformater import TextFormatter
+
+
+def testFormatIsStoredAndReused(tmp_path):
+    cache = DescriptionCache(str(tmp_path))
+    html = cache.format("<b>mod</b>")
+    cache.flush()
+
+    assert html == TextFormatter.format("<b>mod</b>")
+    assert os.listdir(tmp_path) == [f"{cache.key('<b>mod</b>')}.html"]
+
+    # Next launch reads the stored html
+    with open(tmp_path / f"{cache.key('<b>mod</b>')}.html", "w", encoding="UTF-8") as file:
+        file.write("stored")
+    assert DescriptionCache(str(tmp_path)).format("<b>mod</b>") == "stored"
+
+
+def testPrune(tmp_path):
+    cache = DescriptionCache(str(tmp_path))
+    for description in ("a", "b", "c"):
+        cache.format(description)
+    (tmp_path / "left.html.tmp").write_text("")
+
+    cache.prune(["b", "d"])
+    # Pruned on the calling thread, only files are removed by the worker
+    assert list(cache.formatted) == [cache.key("b")]
+
+    cache.flush()
+    assert os.listdir(tmp_path) == [f"{cache.key('b')}.html"]
+
+
+def testWithoutPath():
+    cache = DescriptionCache()
+    assert cache.format("text") == TextFormatter.format("text")
+
+    cache.prune([])
+    cache.flush()
+    assert cache.formatted == {}
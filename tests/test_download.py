@@ -0,0 +1,172 @@
+import os
+import time
+import threading
+
+import pytest
+
+pytest.importorskip("requests")
+
+from fileserver import FileServer
+from ui.utils.download import Downloader, DownloadCancelled
+
+
+DATA = os.urandom(3 * 1024 * 1024 + 123)
+CUT = 256 * 1024
+
+
+def download(server: FileServer, path: str, **kwargs) -> dict:
+    return Downloader(backoff=0, timeout=5, **kwargs).download(server.url, path)
+
+
+def offset(request: dict) -> int:
+    """Start of the requested range, data of the last (cut) read isn't kept, so it is at most the bytes sent"""
+    return int(request["headers"]["Range"][len("bytes="):-1])
+
+
+def read(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def testDownload(tmp_path):
+    path = str(tmp_path / "mod.zip")
+
+    with FileServer(DATA, lastModified="Wed, 21 Oct 2015 07:28:00 GMT") as server:
+        validators = download(server, path)
+
+    assert read(path) == DATA
+    assert validators == {"etag": '"v1"', "lastModified": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    assert not os.path.exists(f"{path}.meta")
+
+
+def testResumeCutConnection(tmp_path):
+    path = str(tmp_path / "mod.zip")
+
+    with FileServer(DATA) as server:
+        server.cut(CUT, times=2)
+        validators = download(server, path)
+
+    assert read(path) == DATA
+    assert validators["etag"] == '"v1"'
+
+    first, second, third = server.requests
+    assert "Range" not in first["headers"]
+    assert 0 < offset(second) <= CUT and second["headers"]["If-Range"] == '"v1"'
+    assert offset(second) < offset(third) <= offset(second) + CUT
+
+
+def testResumeNextDownload(tmp_path):
+    """Partial file is kept when retries run out and resumed by the next download"""
+    path = str(tmp_path / "mod.zip")
+
+    with FileServer(DATA) as server:
+        server.cut(CUT)
+        with pytest.raises(Exception):
+            download(server, path, retries=0)
+
+        size = os.path.getsize(path)
+        assert 0 < size <= CUT
+
+        download(server, path, retries=0)
+
+    assert read(path) == DATA
+    assert offset(server.requests[-1]) == size
+
+
+def testCancelDuringBackoff(tmp_path):
+    """Retry backoff is cut short by the cancel event"""
+    path = str(tmp_path / "mod.zip")
+    cancelEvent = threading.Event()
+
+    with FileServer(DATA) as server:
+        server.cut(CUT)
+        threading.Timer(0.1, cancelEvent.set).start()
+
+        start = time.monotonic()
+        with pytest.raises(DownloadCancelled):
+            Downloader(backoff=10, timeout=5).download(server.url, path, cancelEvent=cancelEvent)
+
+    assert time.monotonic() - start < 5
+    assert len(server.requests) == 1
+
+
+def testETagChanged(tmp_path):
+    """Server sends the whole new file when the part was of an old version"""
+    path = str(tmp_path / "mod.zip")
+    newData = os.urandom(len(DATA) // 2)
+
+    with FileServer(DATA) as server:
+        server.cut(CUT)
+        with pytest.raises(Exception):
+            download(server, path, retries=0)
+
+        server.change(newData, '"v2"')
+        validators = download(server, path)
+
+    assert read(path) == newData
+    assert validators["etag"] == '"v2"'
+    assert server.requests[-1]["headers"]["If-Range"] == '"v1"'
+
+
+def testRangeIgnored(tmp_path):
+    path = str(tmp_path / "mod.zip")
+
+    with FileServer(DATA, ranges=False) as server:
+        server.cut(CUT)
+        download(server, path)
+
+    assert read(path) == DATA
+    assert 0 < offset(server.requests[-1]) <= CUT
+
+
+def testRangeNotSatisfiable(tmp_path):
+    """Part longer than the file on the server is dropped and downloaded again"""
+    path = str(tmp_path / "mod.zip")
+
+    with FileServer(DATA) as server:
+        server.cut(CUT)
+        with pytest.raises(Exception):
+            download(server, path, retries=0)
+
+        size = os.path.getsize(path) + len(DATA)
+        with open(path, "ab") as file:
+            file.write(bytes(len(DATA)))
+
+        download(server, path)
+
+    assert read(path) == DATA
+    assert [request["headers"].get("Range") for request in server.requests[1:]] == [f"bytes={size}-", None]
+
+
+def testNoValidatorsNoResume(tmp_path):
+    path = str(tmp_path / "mod.zip")
+
+    with FileServer(DATA, etag=None) as server:
+        server.cut(CUT)
+        download(server, path)
+
+    assert read(path) == DATA
+    assert "Range" not in server.requests[-1]["headers"]
+
+
+def testNotModified(tmp_path):
+    with FileServer(DATA) as server:
+        downloader = Downloader(timeout=5)
+        assert downloader.notModified(server.url, '"v1"', None)
+        assert not downloader.notModified(server.url, '"v0"', None)
+
+
+def testParallelReuseSessionPool(tmp_path):
+    """Parallel jobs share the session, connections are kept alive and reused instead of opened per download"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    downloader = Downloader(poolSize=2, backoff=0, timeout=5)
+    paths = [str(tmp_path / f"mod{n}.zip") for n in range(8)]
+
+    with FileServer(DATA) as server:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda path: downloader.download(server.url, path), paths))
+
+    assert all(read(path) == DATA for path in paths)
+    assert len(server.requests) == len(paths)
+    assert len(server.ports()) <= 2
@@ -0,0 +1,79 @@
+import os
+import time
+
+from ui.utils.downloadcache import DownloadCache
+
+
+def download(cache: DownloadCache, dlId: str, data: bytes) -> str:
+    path = cache.partPath(dlId)
+    with open(path, "wb") as file:
+        file.write(data)
+
+    return path
+
+
+def testPutAndGet(tmp_path):
+    cache = DownloadCache(str(tmp_path), 1024)
+
+    entry = cache.put("1", "url", download(cache, "1", b"a" * 100), etag='"v1"')
+    cache.release(entry)
+
+    assert os.path.exists(cache.archivePath(entry["sha256"]))
+    assert DownloadCache(str(tmp_path), 1024).get("1")["etag"] == '"v1"'
+    assert cache.get("2") is None
+
+
+def testPinnedArchiveIsNotEvicted(tmp_path):
+    cache = DownloadCache(str(tmp_path), 150)
+
+    cache.release(cache.put("1", "url", download(cache, "1", b"a" * 100)))
+    first = cache.acquire("1")
+
+    # Over the limit, least recently used "1" would be evicted but it is being extracted
+    second = cache.put("2", "url", download(cache, "2", b"b" * 100))
+    assert os.path.exists(cache.archivePath(first["sha256"]))
+
+    cache.release(first)
+    assert not os.path.exists(cache.archivePath(first["sha256"]))
+    assert cache.get("1") is None
+
+    cache.release(second)
+    assert os.path.exists(cache.archivePath(second["sha256"]))
+
+
+def testReplacedArchiveIsRemovedOnRelease(tmp_path):
+    cache = DownloadCache(str(tmp_path), 1024)
+
+    cache.release(cache.put("1", "url", download(cache, "1", b"old")))
+    old = cache.acquire("1")
+
+    new = cache.put("1", "url", download(cache, "1", b"new"))
+    assert os.path.exists(cache.archivePath(old["sha256"]))
+
+    cache.release(old)
+    cache.release(new)
+    assert not os.path.exists(cache.archivePath(old["sha256"]))
+    assert cache.get("1")["sha256"] == new["sha256"]
+
+
+def testPruneParts(tmp_path):
+    cache = DownloadCache(str(tmp_path), 250)
+    cache.release(cache.put("1", "url", download(cache, "1", b"a" * 100)))
+
+    stale = download(cache, "2", b"b" * 10)
+    with open(f"{stale}.meta", "w") as file:
+        file.write("{}")
+    os.utime(stale, (0, 0))
+    os.utime(f"{stale}.meta", (0, 0))
+
+    # Together with the archive over maxBytes, the older one is removed
+    older = download(cache, "3", b"c" * 100)
+    os.utime(older, (time.time() - 60,) * 2)
+    newer = download(cache, "4", b"d" * 100)
+
+    cache.prune()
+
+    assert not os.path.exists(stale) and not os.path.exists(f"{stale}.meta")
+    assert not os.path.exists(older)
+    assert os.path.exists(newer)
+    assert cache.get("1") is not None
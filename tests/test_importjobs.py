@@ -0,0 +1,48 @@
+import time
+import threading
+
+from ui.utils.importjobs import ImportJobManager, ImportJobState, ImportCancelled
+
+
+def testBatchIsIdleOnce():
+    idle = []
+    finished = threading.Event()
+
+    def onIdle(jobs):
+        idle.append([job["state"] for job in jobs])
+        finished.set()
+
+    def fail(job):
+        time.sleep(0.05)
+        raise RuntimeError("failed")
+
+    def cancel(job):
+        time.sleep(0.1)
+        raise ImportCancelled(job.name)
+
+    manager = ImportJobManager(2, onIdle=onIdle)
+    manager.submitAll([("a", lambda job: None), ("b", fail), ("c", cancel)])
+
+    assert finished.wait(5)
+    time.sleep(0.1)
+    assert idle == [[ImportJobState.DONE, ImportJobState.FAILED, ImportJobState.CANCELLED]]
+
+
+def testCancelAll():
+    started = threading.Event()
+    states = []
+
+    def target(job):
+        started.set()
+        while True:
+            job.setProgress(0, 1)
+            time.sleep(0.01)
+
+    manager = ImportJobManager(1, onIdle=lambda jobs: states.extend(job["state"] for job in jobs))
+    manager.submitAll([("a", target), ("b", lambda job: None)])
+
+    assert started.wait(5)
+    manager.cancelAll()
+    manager.executor.shutdown(wait=True)
+
+    assert states == [ImportJobState.CANCELLED, ImportJobState.CANCELLED]
@@ -0,0 +1,27 @@
+import time
+
+from ui.utils.poll import PollData
+
+
+def testPollData():
+    values = iter([None, None, 1, None, 2, 3])
+    reads = []
+
+    def read():
+        reads.append(time.monotonic())
+        return next(values, None)
+
+    data = []
+    for value in PollData(read, minWait=0.001, maxWait=0.004):
+        data.append(value)
+        if value == 3:
+            break
+
+    assert data == [1, 2, 3]
+    assert len(reads) == 6
+
+
+def testPollDataDeadline():
+    start = time.monotonic()
+    assert list(PollData(lambda: None, deadline=start + 0.1, maxWait=0.05)) == []
+    assert 0.1 <= time.monotonic() - start < 0.2
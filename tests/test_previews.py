@@ -0,0 +1,65 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip("PySide6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication, QImage
+
+from ui.utils.previews import PreviewCache, PreviewLoader
+
+
+SIDE = 32
+BYTES = SIDE * SIDE * 4
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QGuiApplication.instance() or QGuiApplication([])
+
+
+def previews(folder, count: int) -> list:
+    paths = []
+    for i in range(count):
+        image = QImage(SIDE, SIDE, QImage.Format_ARGB32)
+        image.fill(i)
+        path = str(folder / f"{i}.png")
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def wait(app, loader: PreviewLoader, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while loader.pending and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    assert not loader.pending
+
+
+def testPrefetchStopsWhenCacheIsFull(app, tmp_path):
+    cache = PreviewCache(4 * BYTES)
+    loader = PreviewLoader(cache, maxThreads=4)
+
+    # Everything is queued while the cache is still empty
+    for path in previews(tmp_path, 20):
+        loader.prefetch(path)
+    wait(app, loader)
+
+    assert len(cache.entries) == 4
+    assert cache.evictions == 0
+
+
+def testRequestIsNotDropped(app, tmp_path):
+    cache = PreviewCache(BYTES)
+    loader = PreviewLoader(cache, maxThreads=1)
+    paths = previews(tmp_path, 3)
+
+    for path in paths:
+        loader.prefetch(path)
+    loader.request(paths[2])
+    wait(app, loader)
+
+    assert paths[2] in cache
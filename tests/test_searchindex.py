@@ -0,0 +1,46 @@
+from ui.utils.searchindex import SearchIndex
+
+
+MODS = [("1", "Mod 12 Skin pack", "Author 3", "8.00", ["Skin", "Sound pack"]),
+        ("2", "Another mod", "author 31", "7.10", ["Map"]),
+        ("3", "Big Sword", "Someone", "8.01", ["Weapon"]),
+        ("4", "amod 1", "x", "8.00", [])]
+
+
+def index() -> SearchIndex:
+    searchIndex = SearchIndex()
+    searchIndex.update(MODS)
+    return searchIndex
+
+
+def testSingleWord():
+    searchIndex = index()
+
+    assert searchIndex.search("") is None
+    assert searchIndex.search("   ") is None
+    assert searchIndex.search("mod") == {"1", "2"}
+    assert searchIndex.search("SW") == {"3"}
+    assert searchIndex.search("8.0") == {"1", "3", "4"}
+    assert searchIndex.search("weap") == {"3"}
+
+
+def testWords():
+    searchIndex = index()
+
+    assert searchIndex.search("mod 1") == {"1"}
+    assert searchIndex.search("author 3") == {"1", "2"}
+    assert searchIndex.search("another mod") == {"2"}
+    # Words must follow each other like in the query
+    assert searchIndex.search("mod another") == set()
+    assert searchIndex.search("mod ") == {"1"}
+    assert searchIndex.search(" big") == {"3"}
+    # Tags with spaces
+    assert searchIndex.search("sound p") == {"1"}
+
+
+def testRemove():
+    searchIndex = index()
+    searchIndex.remove("1")
+
+    assert searchIndex.search("mod") == {"2"}
+    assert searchIndex.search("author 3") == {"2"}
@@ -0,0 +1,78 @@
+import os
+
+from ui.utils.sizeindex import FileSizeIndex
+
+
+def write(path, size: int):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(bytes(size))
+
+
+def testSizes(tmp_path):
+    write(tmp_path / "a.bmod", 10)
+    write(tmp_path / "folder" / "b.wem", 20)
+    write(tmp_path / "folder" / "sub" / "c.bin", 30)
+
+    index = FileSizeIndex(str(tmp_path))
+
+    assert index.size(str(tmp_path / "a.bmod")) == 10
+    assert index.size(str(tmp_path / "folder")) == 50
+    assert index.size(str(tmp_path)) == 60
+    assert index.size(str(tmp_path / "missing.bmod")) == 0
+
+
+def testChangedFolderIsScannedAgain(tmp_path):
+    write(tmp_path / "a.bmod", 10)
+    write(tmp_path / "folder" / "b.wem", 20)
+
+    index = FileSizeIndex(str(tmp_path))
+    index.validateInterval = 0
+
+    assert index.size(str(tmp_path / "folder")) == 20
+
+    # Replaced like imports do (temp file renamed over the old one), changes the folder mtime
+    write(tmp_path / "folder" / "b.wem.part", 25)
+    os.replace(tmp_path / "folder" / "b.wem.part", tmp_path / "folder" / "b.wem")
+    write(tmp_path / "c.bmod", 5)
+
+    assert index.size(str(tmp_path / "folder" / "b.wem")) == 25
+    assert index.size(str(tmp_path / "folder")) == 25
+    assert index.size(str(tmp_path / "c.bmod")) == 5
+
+    os.remove(tmp_path / "a.bmod")
+    assert index.size(str(tmp_path / "a.bmod")) == 0
+
+
+def testValidateInterval(tmp_path):
+    write(tmp_path / "a.bmod", 10)
+
+    index = FileSizeIndex(str(tmp_path))
+    index.validateInterval = 3600
+    assert index.size(str(tmp_path)) == 10
+
+    write(tmp_path / "b.bmod", 5)
+    assert index.size(str(tmp_path)) == 10
+
+    index.invalidate()
+    assert index.size(str(tmp_path)) == 15
+
+
+def testOverwrittenFile(tmp_path):
+    write(tmp_path / "folder" / "a.bmod", 10)
+    write(tmp_path / "b.bmod", 5)
+
+    index = FileSizeIndex(str(tmp_path))
+    index.validateInterval = 3600
+    assert index.size(str(tmp_path)) == 15
+
+    # Written in place, the folder mtime doesn't change
+    mtime = os.stat(tmp_path / "folder").st_mtime_ns
+    with open(tmp_path / "folder" / "a.bmod", "r+b") as file:
+        file.write(bytes(30))
+    os.utime(tmp_path / "folder" / "a.bmod", ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+    assert os.stat(tmp_path / "folder").st_mtime_ns == mtime
+
+    assert index.size(str(tmp_path / "folder" / "a.bmod")) == 30
+    assert index.size(str(tmp_path / "folder")) == 30
+    assert index.size(str(tmp_path)) == 35
@@ -0,0 +1,18 @@
+import os
+import json
+
+import pytest
+
+from ui.utils.textformater import TextFormatter
+
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "data", "textformater_golden.json")
+
+with open(GOLDEN_PATH, "r", encoding="UTF-8") as file:
+    GOLDEN = json.load(file)
+
+
+@pytest.mark.parametrize("case", GOLDEN, ids=range(len(GOLDEN)))
+def testGolden(case):
+    """Expected html was produced by the per-tag regex implementation the single pass formatter replaced"""
+    assert TextFormatter.format(case["text"], case.get("textSize", "14px")) == case["html"]
@@ -1,9 +1,17 @@
+import sys
+
 from typing import List
 
-from ..utils.textformater import TextFormatter
+
+def Intern(value):
+    """Strings repeated across many mods (authors, versions, tags) are interned, so every mod refers to one copy"""
+    return sys.intern(value) if type(value) is str else value
 
 
 class ModClass:
+    __slots__ = ("gameVersion", "name", "author", "version", "rawDescription", "tags", "previewsPaths", "hash",
+                 "platform", "installed", "currentVersion", "modFileExist", "modPath", "modCachePath", "dateAdded")
+
     def __init__(self,
                  gameVersion: str,
                  name: str,
@@ -21,15 +29,16 @@ class ModClass:
                  modCachePath: str,
                  dateAdded: float
                  ):
-        self.gameVersion = gameVersion
+        self.gameVersion = Intern(gameVersion)
         self.name = name
-        self.author = author
-        self.version = version
-        self.description = TextFormatter.format(description)
-        self.tags = tags
-        self.previewsPaths = previewsPaths
+        self.author = Intern(author)
+        self.version = Intern(version)
+        # Formatted when the mod is selected (Mods.descriptions)
+        self.rawDescription = description
+        self.tags = tuple(Intern(tag) for tag in tags)
+        self.previewsPaths = tuple(previewsPaths)
         self.hash = hash
-        self.platform = platform
+        self.platform = Intern(platform)
         self.installed = installed
         self.currentVersion = currentVersion
         self.modFileExist = modFileExist
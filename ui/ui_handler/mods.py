@@ -1,24 +1,28 @@
-from typing import List, Dict
+from typing import List, Dict, Iterable
 import os
 import datetime
 import random
-import json
 import time
 
-from PySide6.QtWidgets import QWidget, QPushButton, QVBoxLayout, QFrame, QLabel, QMenu
-from PySide6.QtGui import QPixmap, QPaintEvent, QIcon, QCursor, QAction
-from PySide6.QtCore import QSize, Qt, QPoint
+from PySide6.QtWidgets import QWidget, QPushButton, QMenu
+from PySide6.QtGui import QPixmap, QImage, QIcon, QCursor, QAction
+from PySide6.QtCore import QSize, Qt, QPoint, QEvent
 
-from .modbutton import ModButton
 from .modclass import ModClass
+from .modslist import ModsListModel, ModsFilterModel, ModsListView, ModClassRole
 
 from ..ui_sources.ui_mods import Ui_Mods
 from ..ui_sources.ui_mod_body import Ui_ModBody
 from ..ui_sources.ui_mods_actions import Ui_ModsActions
 
 from ..utils.buttons import AddButtonWidthToTexSize
-from ..utils.layout import AddToFrame, ClearFrame
+from ..utils.descriptions import DescriptionCache
+from ..utils.layout import AddToFrame
 from ..utils.buttongroup import ButtonGroup
+from ..utils.previews import PreviewLoader, PreviewCache
+from ..utils.searchindex import SearchIndex
+from ..utils.sizeindex import FileSizeIndex
+from ..utils.timestamps import TimestampStore
 
 
 # TODO: Add gif or video in previews
@@ -78,10 +82,11 @@ class NavigateButton(ButtonGroup):
 
 class Mods(QWidget):
     defaultPreview = ":/images/resources/images/DefaultPreview.png"
-    cachePreviews: Dict[str, QPixmap] = {}
-    selectedModButton: ModButton = None
+    loadingPreview = ":/images/resources/images/LoadPreview.png"
+    # Decoded previews of all mods, limited by size in bytes
+    cachePreviews = PreviewCache(maxBytes=128 * 1024 * 1024)
+    selectedMod: ModClass = None
     mods: Dict[str, ModClass] = {}
-    modsButtons: List[ModButton] = []
     
     # Variables to track sorting state
     SORT_BY_NAME = "name"
@@ -96,11 +101,21 @@ class Mods(QWidget):
         self.ui = Ui_Mods()
         self.ui.setupUi(self)
 
-        self.timestamps_file = os.path.join(os.getcwd(), "mod_timestamps.json")
-        self.mod_timestamps = self.load_timestamps()
+        # Loaded on the first date sort
+        self.modsTimestamps = TimestampStore(os.path.join(os.getcwd(), "mod_timestamps.json"))
+
+        self.modsSizes = FileSizeIndex(os.path.join(os.getcwd(), "Mods"))
+
+        # Formatted descriptions are kept on disk, unchanged mods are not formatted again on next launch
+        self.descriptions = DescriptionCache(os.path.join(os.getcwd(), "descriptions_cache"))
 
         self.preview = None
         self.previews: List[QPixmap] = []
+        self.previewsPaths: List[str] = []
+        self.previewNum = 0
+        self.placeholderPreview = QPixmap(self.loadingPreview)
+        self.previewLoader = PreviewLoader(self.cachePreviews)
+        self.previewLoader.loaded.connect(self.onPreviewLoaded)
         self.previewsNavigate: List[NavigateButton] = [NavigateButton(n, self.setPreviewNum) for n in range(6)]
         self.previewRatio = 1
 
@@ -109,27 +124,34 @@ class Mods(QWidget):
         self.body.setupUi(bodyWidget)
         self.ui.scrollBody.setWidget(bodyWidget)
 
-        self.ui.modBody.installEventFilter(self)
+        # Inputs of the last body layout, it is only recomputed when one of them changes
+        self.bodyLayoutKey = None
+
+        # Body layout depends on sizes of these widgets, scroll bar visibility and description height
+        for widget in (self.ui.modBody, self.ui.scrollBody.verticalScrollBar(), self.body.modTags,
+                       self.body.modActions):
+            widget.installEventFilter(self)
+        self.body.modDescription.document().documentLayout().documentSizeChanged.connect(self.onResize)
+
         self.modDescriptionsAndActionsLayout = self.body.modDescriptionsAndActions.layout()
 
         self.body.leftPreview.clicked.connect(self.leftPreview)
         self.body.rightPreview.clicked.connect(self.rightPreview)
 
-        modsListFrame = QFrame()
-        layout = QVBoxLayout(modsListFrame)
-        layout.setSpacing(0)
-        layout.setContentsMargins(2, 5, 2, 5)
-        self.modsList = QFrame()
-        self.modsList.setMaximumWidth(self.ui.modsList.maximumWidth())
-        layout2 = QVBoxLayout(self.modsList)
-        layout2.setSpacing(1)
-        layout2.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self.modsList, 0, Qt.AlignTop)
-        self.ui.scrollModsList.setWidget(modsListFrame)
+        # Mods list is a model/view, only visible rows are painted
+        self.modsModel = ModsListModel(self)
+        # Search filters rows through a proxy, rows keep the order of modsModel
+        self.modsFilter = ModsFilterModel(self)
+        self.modsFilter.setSourceModel(self.modsModel)
+        self.modsListView = ModsListView(self.ui.scrollModsList.styleSheet())
+        self.modsListView.setModel(self.modsFilter)
+        self.modsListView.selectionModel().currentChanged.connect(self.onCurrentModChanged)
+        self.ui.verticalLayout_2.replaceWidget(self.ui.scrollModsList, self.modsListView)
+        self.ui.scrollModsList.setParent(None)
+
+        self.searchIndex = SearchIndex()
 
         self.resizeEvent = self.onResize
-        self.origScrollModsListResizeEvent = self.ui.scrollModsList.resizeEvent
-        self.ui.scrollModsList.resizeEvent = self.onModsListResize
 
         actionsWidget = QWidget()
         self.modsActions = Ui_ModsActions()
@@ -159,61 +181,27 @@ class Mods(QWidget):
 
         self.setPreviewsPaths([self.defaultPreview])
 
-    def load_timestamps(self):
-        if os.path.exists(self.timestamps_file):
-            try:
-                with open(self.timestamps_file, 'r') as f:
-                    return json.load(f)
-            except (IOError, json.JSONDecodeError):
-                return {}
-        return {}
-
-    def save_timestamps(self):
-        try:
-            with open(self.timestamps_file, 'w') as f:
-                json.dump(self.mod_timestamps, f, indent=4)
-        except IOError:
-            print(f"Warning: Could not save timestamps to {self.timestamps_file}")
-
     def loadPreview(self, pixmap: QPixmap):
-        self.previewRatio = pixmap.width() / pixmap.height()
+        # Placeholder keeps ratio of the previous preview
+        if pixmap is not self.placeholderPreview and not pixmap.isNull():
+            self.previewRatio = pixmap.width() / pixmap.height()
         self.body.modPreview.setPixmap(pixmap)
         self.onResize()
 
     def searchEvent(self, text):
-        if not text:
-            displayModButtons = self.modsButtons
-        else:
-            text = text.casefold()
-
-            if len(text.split(" ")) == 1:
-                text = f" {text}"
-
-            displayModButtons = [
-                modButton
-                for modButton in self.modsButtons
-                if any([
-                    text in f" {modButton.modClass.name.lower()}",
-                    text in f" {modButton.modClass.author.lower()}",
-                    modButton.modClass.gameVersion.startswith(text.strip()),
-                    any([tag.casefold().lower().startswith(text.strip()) for tag in modButton.modClass.tags])
-                ])
-            ]
-
-        # Remove all mod buttons from the UI
-        for modButton in self.modsButtons:
-            modButton.remove()
-
-        # Re-add the filtered mod buttons, maintaining current sort order
-        for modButton in displayModButtons:
-            modButton.restore(self.modsList)
-        
-        # If there's a selected mod in the filtered results, ensure it stays selected
-        if self.selectedModButton is not None and self.selectedModButton in displayModButtons:
-            self.selectedModButton.select()
+        self.modsFilter.setVisible(self.searchIndex.search(text))
 
     def onResize(self, *a):
-        width = self.ui.scrollBody.width() - (7 if self.ui.scrollBody.verticalScrollBar().isVisible() else 0)
+        scrollBarVisible = self.ui.scrollBody.verticalScrollBar().isVisible()
+        modDescriptionDocumentHeight = self.body.modDescription.document().size().height()
+
+        bodyLayoutKey = (self.ui.scrollBody.width(), scrollBarVisible, self.previewRatio, self.ui.modBody.height(),
+                         self.body.modTags.height(), self.body.modActions.height(), modDescriptionDocumentHeight)
+        if bodyLayoutKey == self.bodyLayoutKey:
+            return
+        self.bodyLayoutKey = bodyLayoutKey
+
+        width = self.ui.scrollBody.width() - (7 if scrollBarVisible else 0)
         imageHeight = self.ui.scrollBody.width() // self.previewRatio
 
         self.body.modPreview.setGeometry(0, 0, width, imageHeight)
@@ -228,67 +216,54 @@ class Mods(QWidget):
                                self.body.modActions.height() - tMargin - bMargin - spacing * \
                                (self.modDescriptionsAndActionsLayout.count() - 1)
 
-        modDescriptionDocumentHeight = self.body.modDescription.document().size().height()
-
         if modDescriptionDocumentHeight > modDescriptionHeight:
             self.body.modDescription.setMinimumHeight(modDescriptionDocumentHeight)
         else:
             self.body.modDescription.setMinimumHeight(modDescriptionHeight)
 
-    def onModsListResize(self, event):
-        for n in range(self.modsList.layout().count()):
-            w = self.modsList.layout().takeAt(0).widget()
-            w.onParentResize()
-            self.modsList.layout().addWidget(w)
-
-        self.origScrollModsListResizeEvent(event)
-
     def eventFilter(self, qobject, event):
-        # if event.type() not in [QEvent.HoverMove, QEvent.PolishRequest, QEvent.Paint, QEvent.MouseMove]:
-        #    print(event.type())
-
-        if isinstance(event, QPaintEvent):
+        if event.type() in (QEvent.Resize, QEvent.Show, QEvent.Hide):
             self.onResize(event)
 
         return False
 
     def leftPreview(self):
-        n = 0
-        for preview in self.previews:
-            if self.body.modPreview.pixmap().cacheKey() == preview.cacheKey():
-                break
-            else:
-                n += 1
-
-        if n == 0:
+        if self.previewNum == 0:
             self.setPreviewNum(len(self.previews) - 1)
         else:
-            self.setPreviewNum(n - 1)
+            self.setPreviewNum(self.previewNum - 1)
 
     def rightPreview(self):
-        n = 0
-        for preview in self.previews:
-            if self.body.modPreview.pixmap().cacheKey() == preview.cacheKey():
-                break
-            else:
-                n += 1
-
-        if n == len(self.previews) - 1:
+        if self.previewNum == len(self.previews) - 1:
             self.setPreviewNum(0)
         else:
-            self.setPreviewNum(n + 1)
+            self.setPreviewNum(self.previewNum + 1)
 
     def cachePreview(self, path: str) -> QPixmap:
-        if path not in self.cachePreviews:
-            pixmap = QPixmap(path.replace("\\", "/"))
-            self.cachePreviews[path] = pixmap
-        else:
-            pixmap = self.cachePreviews[path]
+        """Pixmap of decoded preview, or placeholder (decoding is requested in background)"""
+        preview = self.cachePreviews.get(path)
+
+        if preview is None:
+            self.previewLoader.request(path)
+            return self.placeholderPreview
+
+        if isinstance(preview, QImage):
+            preview = QPixmap.fromImage(preview)
+            self.cachePreviews.put(path, preview)
+
+        return preview
 
-        return pixmap
+    def onPreviewLoaded(self, path: str):
+        for n, previewPath in enumerate(self.previewsPaths):
+            if previewPath == path:
+                self.previews[n] = self.cachePreview(path)
+
+                if n == self.previewNum:
+                    self.loadPreview(self.previews[n])
 
     def setPreviewNum(self, n):
         if -1 < n < len(self.previews):
+            self.previewNum = n
             self.previewsNavigate[n].setActive()
             self.loadPreview(self.previews[n])
 
@@ -315,6 +290,8 @@ class Mods(QWidget):
             self.body.leftPreview.setMaximumWidth(30)
             self.body.rightPreview.setMaximumWidth(30)
 
+        self.previewsPaths = list(paths)
+        self.previewNum = 0
         for n, path in enumerate(paths):
             pixmap = self.cachePreview(path)
             self.previews.append(pixmap)
@@ -322,7 +299,7 @@ class Mods(QWidget):
         self.loadPreview(self.previews[0])
 
     def updateData(self):
-        modClass = self.selectedModButton.modClass
+        modClass = self.selectedMod
 
         self.modsActions.webPage.setParent(None)
         self.modsActions.install.setParent(None)
@@ -345,25 +322,29 @@ class Mods(QWidget):
         self.body.modName.setText(modClass.name)
         self.body.modSource.setText("Source: " + str(modClass.platform))
         self.body.modVersion.setText("Version: " + str(modClass.version))
-        self.body.modDescription.setText(modClass.description)
+        self.body.modDescription.setText(self.descriptions.format(modClass.rawDescription))
         self.body.modTags.setText("Tags: " + ", ".join(modClass.tags))
 
     def selectMod(self, modClass: ModClass):
-        for modButton in self.modsButtons:
-            if modButton.modClass == modClass:
-                self.selectedModButton = modButton
+        self.selectedMod = modClass
+
+        row = self.modsModel.rowOf(modClass)
+        if row != -1:
+            index = self.modsFilter.mapFromSource(self.modsModel.index(row))
+            if index.isValid() and self.modsListView.currentIndex() != index:
+                self.modsListView.setCurrentIndex(index)
 
         self.updateData()
 
-    def addModButton(self, modClass: ModClass):
-        modButton = ModButton(modClass=modClass,
-                              method=self.selectMod)
+    def onCurrentModChanged(self, current, previous):
+        modClass = current.data(ModClassRole)
 
-        self.modsButtons.append(modButton)
-        AddToFrame(self.modsList, modButton)
+        if modClass is not None and modClass is not self.selectedMod:
+            self.selectMod(modClass)
 
-        if not self.selectedModButton:
-            modButton.select()
+    def updateMod(self, modClass: ModClass):
+        """Repaint row of the mod (e.g. after install state changed)"""
+        self.modsModel.updateMod(modClass)
 
     def reinstallAllMods(self):
         self.window().buttonsDialog.setTitle("Reinstall All Mods")
@@ -377,9 +358,9 @@ class Mods(QWidget):
     def _reinstallAllMods(self):
         self.window().buttonsDialog.hide()
         installed_mods = [
-            mod_button.modClass
-            for mod_button in self.modsButtons
-            if mod_button.modClass.installed
+            modClass
+            for modClass in self.modsModel.modClasses
+            if modClass.installed
         ]
         for mod in installed_mods:
             self.window().reinstallMod(mod.hash)
@@ -401,40 +382,77 @@ class Mods(QWidget):
                modCachePath: str,
                dateAdded: float):
 
-        for path in previewsPaths:
-            self.cachePreview(path)
-
-        mod = ModClass(gameVersion,
-                       name,
-                       author,
-                       version,
-                       description,
-                       tags,
-                       previewsPaths,
-                       hash,
-                       platform,
-                       installed,
-                       currentVersion,
-                       modFileExist,
-                       modPath,
-                       modCachePath,
-                       dateAdded)
-
-        self.mods[hash] = mod
-        self.addModButton(mod)
-        
-        # Apply current sort when a new mod is added
-        if len(self.modsButtons) > 1:  # Only sort if there's more than one mod
-            self.sortMods(self.sortBy, self.sortAscending)
+        self.insertMods([ModClass(gameVersion,
+                                  name,
+                                  author,
+                                  version,
+                                  description,
+                                  tags,
+                                  previewsPaths,
+                                  hash,
+                                  platform,
+                                  installed,
+                                  currentVersion,
+                                  modFileExist,
+                                  modPath,
+                                  modCachePath,
+                                  dateAdded)])
+
+    def addMods(self, modsData: Iterable[dict]):
+        """Add mods from core mods data, all of them are sorted and inserted at once"""
+        self.insertMods([ModClass(gameVersion=modData.get("gameVersion", ""),
+                                  name=modData.get("name", ""),
+                                  author=modData.get("author", ""),
+                                  version=modData.get("version", ""),
+                                  description=modData.get("description", ""),
+                                  tags=modData.get("tags", []),
+                                  previewsPaths=modData.get("previewsPaths", []),
+                                  hash=modData.get("hash", ""),
+                                  platform=modData.get("platform", ""),
+                                  installed=modData.get("installed", False),
+                                  currentVersion=modData.get("currentVersion", False),
+                                  modFileExist=modData.get("modFileExist", False),
+                                  modPath=modData.get("modPath", ""),
+                                  modCachePath=modData.get("modCachePath", ""),
+                                  dateAdded=modData.get("dateAdded", 0.0))
+                         for modData in modsData])
+
+    def insertMods(self, modClasses: List[ModClass]):
+        if not modClasses:
+            return
+
+        for mod in modClasses:
+            # Decode the first preview (shown when the mod is selected) in background, the others are requested when
+            # the mod is selected. Prefetched previews are dropped once the cache is full
+            if mod.previewsPaths:
+                self.previewLoader.prefetch(mod.previewsPaths[0])
+
+            self.mods[mod.hash] = mod
+
+        self.searchIndex.update((mod.hash, mod.name, mod.author, mod.gameVersion, mod.tags) for mod in modClasses)
+
+        self.modsListView.setUpdatesEnabled(False)
+        try:
+            self.modsModel.addMods(modClasses)
 
-    def removeAllMods(self):
-        ClearFrame(self.modsList)
+            # Apply current sort once for all new mods
+            if self.modsModel.rowCount() > 1:  # Only sort if there's more than one mod
+                self.sortMods(self.sortBy, self.sortAscending)
+
+            if self.ui.searchArea.text():
+                self.searchEvent(self.ui.searchArea.text())
+        finally:
+            self.modsListView.setUpdatesEnabled(True)
 
-        self.selectedModButton = None
-        for modButton in self.modsButtons:
-            modButton.__del__()
-            del modButton
-        self.modsButtons.clear()
+        if self.selectedMod is None:
+            self.selectMod(self.modsModel.modClass(0))
+
+    def removeAllMods(self):
+        self.selectedMod = None
+        self.modsModel.clear()
+        self.searchIndex.clear()
+        self.modsFilter.setVisible(None)
+        self.modsSizes.invalidate()
 
         for modClass in self.mods.values():
             del modClass
@@ -502,101 +520,33 @@ class Mods(QWidget):
         self.sortBy = sortBy
         self.sortAscending = ascending
         
-        # Sort the modsButtons list based on criteria
+        # Sort the mods list based on criteria
         if sortBy == self.SORT_BY_NAME:
-            self.modsButtons.sort(key=lambda mb: mb.modClass.name.lower(), reverse=not ascending)
+            self.modsModel.sortMods(key=lambda modClass: modClass.name.lower(), reverse=not ascending)
         elif sortBy == self.SORT_BY_DATE:
-            def get_mod_time(mod_button):
-                timestamp = mod_button.modClass.dateAdded
-                mod_hash = mod_button.modClass.hash
+            # Mods without date get the current time, saved once for the whole sort
+            now = time.time()
+            newTimestamps = {modClass.hash: now for modClass in self.modsModel.modClasses
+                             if modClass.dateAdded <= 0 and modClass.hash not in self.modsTimestamps}
+            self.modsTimestamps.update(newTimestamps)
 
-                if timestamp > 0:
-                    return timestamp
+            def get_mod_time(modClass):
+                if modClass.dateAdded > 0:
+                    return modClass.dateAdded
 
-                if mod_hash in self.mod_timestamps:
-                    return self.mod_timestamps[mod_hash]
+                return self.modsTimestamps.get(modClass.hash, now)
 
-                new_timestamp = time.time()
-                self.mod_timestamps[mod_hash] = new_timestamp
-                self.save_timestamps()
-                return new_timestamp
-            self.modsButtons.sort(key=get_mod_time, reverse=not ascending)
+            self.modsModel.sortMods(key=get_mod_time, reverse=not ascending)
         elif sortBy == self.SORT_BY_SIZE:
-            # Get the mod file size based on mod name and hash
-            def get_mod_size(mod_button):
-                try:
-                    # Skip if mod doesn't have a file
-                    if not mod_button.modClass.modFileExist:
-                        return 0
-                    
-                    mod_name = mod_button.modClass.name
-                    mod_hash = mod_button.modClass.hash
-                    mods_dir = os.path.join(os.getcwd(), "Mods")
-                    
-                    # First try: direct match with hash in filename
-                    for root, _, files in os.walk(mods_dir):
-                        for file in files:
-                            if file.endswith(".bmod") and mod_hash in file:
-                                file_path = os.path.join(root, file)
-                                return os.path.getsize(file_path)
-                    
-                    # Second try: match with sanitized mod name
-                    # Remove special characters from mod name for filename comparison
-                    sanitized_name = ''.join(c for c in mod_name if c.isalnum() or c in ' -_').strip()
-                    sanitized_name = sanitized_name.lower().replace(' ', '')
-                    
-                    for root, _, files in os.walk(mods_dir):
-                        for file in files:
-                            if not file.endswith(".bmod"):
-                                continue
-                                
-                            file_name = os.path.splitext(file)[0].lower()
-                            file_name = ''.join(c for c in file_name if c.isalnum()).strip()
-                            
-                            if sanitized_name and sanitized_name in file_name:
-                                file_path = os.path.join(root, file)
-                                return os.path.getsize(file_path)
-                    
-                    # Third try: if we have only one mod file and one mod, use that
-                    if len(self.mods) == 1:
-                        for root, _, files in os.walk(mods_dir):
-                            for file in files:
-                                if file.endswith(".bmod"):
-                                    file_path = os.path.join(root, file)
-                                    return os.path.getsize(file_path)
-                    
-                    # Last resort: check each subdirectory with the mod name
-                    for root, dirs, _ in os.walk(mods_dir):
-                        for dir_name in dirs:
-                            if sanitized_name and sanitized_name in dir_name.lower().replace(' ', ''):
-                                dir_path = os.path.join(root, dir_name)
-                                # Get total size of all files in this directory
-                                total_size = 0
-                                for sub_root, _, files in os.walk(dir_path):
-                                    for file in files:
-                                        try:
-                                            file_path = os.path.join(sub_root, file)
-                                            total_size += os.path.getsize(file_path)
-                                        except (IOError, OSError):
-                                            continue
-                                return total_size
-                
-                except Exception as e:
-                    print(f"Error getting size for mod {mod_button.modClass.name}: {str(e)}")
+            def get_mod_size(modClass):
+                # Skip if mod doesn't have a file
+                if not modClass.modFileExist or not modClass.modPath:
                     return 0
-                
-                return 0  # Default if no matching file found
-                            
-            self.modsButtons.sort(key=get_mod_size, reverse=not ascending)
-        
-        # Remove all mod buttons from the UI
-        for modButton in self.modsButtons:
-            modButton.remove()
-        
-        # Re-add mod buttons in sorted order
-        for modButton in self.modsButtons:
-            modButton.restore(self.modsList)
+
+                return self.modsSizes.size(modClass.modPath)
+
+            self.modsModel.sortMods(key=get_mod_size, reverse=not ascending)
         
-        # If a mod was selected, make sure it stays selected
-        if self.selectedModButton is not None:
-            self.selectedModButton.select()
+        # If a mod was selected, make sure it stays visible
+        if self.selectedMod is not None:
+            self.modsListView.scrollTo(self.modsListView.currentIndex())
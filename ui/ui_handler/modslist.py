@@ -0,0 +1,275 @@
+from typing import List, Dict, Tuple, Callable, Optional, Set
+
+from PySide6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView, QFrame
+from PySide6.QtGui import QFont, QFontMetrics, QColor, QPainter, QPixmap, QCursor
+from PySide6.QtCore import Qt, QAbstractListModel, QSortFilterProxyModel, QModelIndex, QSize, QRect
+
+from .modclass import ModClass
+
+
+ModClassRole = Qt.UserRole + 1
+
+
+class ModsListModel(QAbstractListModel):
+    """Flat list of ModClass, only the rows visible in the view are painted"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.modClasses: List[ModClass] = []
+        # Mod hash -> row
+        self.rows: Dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.modClasses)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self.modClasses):
+            return None
+
+        modClass = self.modClasses[index.row()]
+
+        if role == ModClassRole:
+            return modClass
+        elif role == Qt.DisplayRole:
+            return modClass.name
+        elif role == Qt.ToolTipRole:
+            return f"{modClass.name}\nAuthor: {modClass.author}"
+
+        return None
+
+    def modClass(self, row: int) -> Optional[ModClass]:
+        if 0 <= row < len(self.modClasses):
+            return self.modClasses[row]
+
+        return None
+
+    def rowOf(self, modClass: ModClass) -> int:
+        row = self.rows.get(modClass.hash, -1)
+        if row != -1 and self.modClasses[row] is modClass:
+            return row
+
+        return -1
+
+    def rowOfHash(self, modHash: str) -> int:
+        return self.rows.get(modHash, -1)
+
+    def addMod(self, modClass: ModClass):
+        self.addMods([modClass])
+
+    def addMods(self, modClasses: List[ModClass]):
+        row = len(self.modClasses)
+        self.beginInsertRows(QModelIndex(), row, row + len(modClasses) - 1)
+        self.modClasses.extend(modClasses)
+        self.rows.update((modClass.hash, row + i) for i, modClass in enumerate(modClasses))
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.modClasses.clear()
+        self.rows.clear()
+        self.endResetModel()
+
+    def sortMods(self, key: Callable[[ModClass], object], reverse: bool = False):
+        self.layoutAboutToBeChanged.emit()
+
+        oldRows = [id(modClass) for modClass in self.modClasses]
+        self.modClasses.sort(key=key, reverse=reverse)
+        self.rows = {modClass.hash: row for row, modClass in enumerate(self.modClasses)}
+
+        # Keep selection and hidden rows of the view on the same mods
+        rowsById = {id(modClass): row for row, modClass in enumerate(self.modClasses)}
+        newRows = [rowsById[modId] for modId in oldRows]
+
+        oldIndexes = self.persistentIndexList()
+        self.changePersistentIndexList(oldIndexes, [self.index(newRows[index.row()]) for index in oldIndexes])
+
+        self.layoutChanged.emit()
+
+    def updateMod(self, modClass: ModClass):
+        row = self.rowOf(modClass)
+        if row != -1:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+
+class ModsFilterModel(QSortFilterProxyModel):
+    """Rows of mods found by the search, the view is refiltered once per query instead of once per row"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Hashes of visible mods, None shows all
+        self.visible: Optional[Set[str]] = None
+        # filterAcceptsRow runs once per row, the list of the source model is kept instead of calling sourceModel()
+        self.modClasses: List[ModClass] = []
+
+    def setSourceModel(self, sourceModel: ModsListModel):
+        self.modClasses = sourceModel.modClasses
+        super().setSourceModel(sourceModel)
+
+    def setVisible(self, visible: Optional[Set[str]]):
+        if visible is None and self.visible is None:
+            return
+
+        self.visible = visible
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, sourceRow: int, sourceParent: QModelIndex) -> bool:
+        if self.visible is None:
+            return True
+
+        return self.modClasses[sourceRow].hash in self.visible
+
+
+class ModDelegate(QStyledItemDelegate):
+    """Paints a mod row the same way the old per-mod widget did: [gameVersion] name / author / state icon"""
+
+    height = 48
+    spacing = 1
+    padding = 7
+    iconSize = 20
+
+    nameFont = QFont()
+    nameFont.setFamilies([u"Roboto Medium"])
+    nameFont.setPointSize(12)
+
+    authorFont = QFont()
+    authorFont.setFamilies([u"Roboto Medium"])
+    authorFont.setPointSize(10)
+
+    background = QColor("#24638C")
+    nameColor = QColor("#eeeeee")
+    authorColor = QColor("#B1BA96")
+    currentVersionColor = QColor("#43C15F")
+    oldVersionColor = QColor("#3FAED1")
+
+    # Max entries of the elided text cache, it is dropped as a whole when full
+    elideCacheSize = 4096
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.nameMetrics = QFontMetrics(self.nameFont)
+        self.authorMetrics = QFontMetrics(self.authorFont)
+
+        # (font metrics id, text, width) -> elided text
+        self.elideCache: Dict[Tuple[int, str, int], str] = {}
+        # "[gameVersion]" -> width, there are only a few game versions
+        self.versionWidths: Dict[str, int] = {}
+
+        self.stateIcons = {
+            "installed": QPixmap(u":/icons/resources/icons/Installed.png"),
+            "ghost": QPixmap(u":/icons/resources/icons/GhostInstalled.png"),
+            "notInstalled": QPixmap(u":/icons/resources/icons/NotInstalled.png"),
+        }
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.height + self.spacing)
+
+    def versionWidth(self, gameVersion: str) -> int:
+        width = self.versionWidths.get(gameVersion)
+        if width is None:
+            width = self.versionWidths[gameVersion] = self.nameMetrics.horizontalAdvance(gameVersion)
+
+        return width
+
+    def elidedText(self, metrics: QFontMetrics, text: str, width: int) -> str:
+        key = (id(metrics), text, width)
+
+        elided = self.elideCache.get(key)
+        if elided is None:
+            if len(self.elideCache) >= self.elideCacheSize:
+                self.elideCache.clear()
+
+            elided = self.elideCache[key] = metrics.elidedText(text, Qt.ElideRight, width)
+
+        return elided
+
+    def stateIcon(self, modClass: ModClass) -> QPixmap:
+        if modClass.installed and modClass.modFileExist:
+            return self.stateIcons["installed"]
+        elif modClass.installed:
+            return self.stateIcons["ghost"]
+        else:
+            return self.stateIcons["notInstalled"]
+
+    def paint(self, painter: QPainter, option, index: QModelIndex):
+        modClass: ModClass = index.data(ModClassRole)
+        if modClass is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        rect: QRect = option.rect.adjusted(0, 0, 0, -self.spacing)
+
+        background = QColor(self.background)
+        if option.state & QStyle.State_Selected:
+            background.setAlpha(0xFF if not option.state & QStyle.State_MouseOver else 0xFE)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(background)
+            painter.drawRoundedRect(rect, 5, 5)
+        elif option.state & QStyle.State_MouseOver:
+            background.setAlpha(0x77)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(background)
+            painter.drawRoundedRect(rect, 5, 5)
+
+        content = rect.adjusted(self.padding, 3, -self.padding, -3)
+        textWidth = content.width() - self.iconSize
+
+        # [gameVersion] name
+        nameMetrics = self.nameMetrics
+        lineHeight = content.height() // 2
+
+        gameVersion = f"[{modClass.gameVersion}]"
+        versionWidth = self.versionWidth(gameVersion)
+
+        painter.setFont(self.nameFont)
+        painter.setPen(self.currentVersionColor if modClass.currentVersion else self.oldVersionColor)
+        painter.drawText(QRect(content.left(), content.top(), versionWidth, lineHeight),
+                         Qt.AlignLeft | Qt.AlignVCenter, gameVersion)
+
+        nameLeft = content.left() + versionWidth + 6
+        name = self.elidedText(nameMetrics, modClass.name, max(0, content.left() + textWidth - nameLeft))
+        painter.setPen(self.nameColor)
+        painter.drawText(QRect(nameLeft, content.top(), content.left() + textWidth - nameLeft, lineHeight),
+                         Qt.AlignLeft | Qt.AlignVCenter, name)
+
+        # Author
+        author = self.elidedText(self.authorMetrics, f"Author: {modClass.author}", textWidth)
+        painter.setFont(self.authorFont)
+        painter.setPen(self.authorColor)
+        painter.drawText(QRect(content.left(), content.top() + lineHeight, textWidth, content.height() - lineHeight),
+                         Qt.AlignLeft | Qt.AlignVCenter, author)
+
+        # State icon
+        painter.drawPixmap(QRect(content.right() - self.iconSize + 1,
+                                 rect.top() + (rect.height() - self.iconSize) // 2,
+                                 self.iconSize, self.iconSize),
+                           self.stateIcon(modClass))
+
+        painter.restore()
+
+
+class ModsListView(QListView):
+    def __init__(self, styleSheet: str = "", parent=None):
+        super().__init__(parent)
+
+        self.setStyleSheet(styleSheet + "\nQListView{border: none; background-color: #00000000; padding: 5px 2px;}")
+        self.setFrameShape(QFrame.NoFrame)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setCursor(QCursor(Qt.PointingHandCursor))
+        self.setMouseTracking(True)
+        # All rows have the delegate height, resizing doesn't query every row
+        self.setUniformItemSizes(True)
+        self.viewport().setAttribute(Qt.WA_Hover)
+
+        self.setItemDelegate(ModDelegate(self))
@@ -1,10 +1,18 @@
-from PySide6.QtWidgets import QWidget
-from PySide6.QtGui import QPaintEvent
+from typing import Callable, Optional
+
+from PySide6.QtWidgets import QWidget, QPushButton
+from PySide6.QtGui import QPaintEvent, QFont, QCursor
+from PySide6.QtCore import QTimer, Qt
 
 from ..ui_sources.ui_progress_dialog import Ui_ProgressDialog
+from ..utils.progress import ProgressCounter
 
 
 class ProgressDialog(QWidget):
+    font = QFont()
+    font.setFamilies([u"Roboto Medium"])
+    font.setPointSize(10)
+
     def __init__(self, window):
         super().__init__()
 
@@ -13,6 +21,14 @@ class ProgressDialog(QWidget):
 
         self.mainWindow = window
 
+        self.progress = ProgressCounter()
+        self.progressTimer = QTimer()
+        self.progressTimer.setSingleShot(True)
+        self.progressTimer.timeout.connect(self.updateProgress)
+
+        self.cancelButton: Optional[QPushButton] = None
+        self.cancelMethod: Optional[Callable] = None
+
     def onResize(self):
         self.setGeometry(0, 0, self.mainWindow.width(), self.mainWindow.height())
 
@@ -37,6 +53,35 @@ class ProgressDialog(QWidget):
     def addContent(self):
         self.ui.content.setParent(self.ui.dialogBackground)
 
+    def setCancel(self, method: Optional[Callable]):
+        """Show a "Cancel" button calling `method`, None hides it"""
+        # Bound methods are new objects on every attribute access, so they are compared by value
+        if method == self.cancelMethod:
+            return
+
+        self.cancelMethod = method
+
+        if method is None:
+            if self.cancelButton is not None:
+                self.cancelButton.hide()
+            return
+
+        # Button is created once and kept, only the called method changes
+        if self.cancelButton is None:
+            self.cancelButton = QPushButton("Cancel")
+            self.cancelButton.setFont(self.font)
+            self.cancelButton.setCursor(QCursor(Qt.PointingHandCursor))
+            self.cancelButton.setStyleSheet("QPushButton{color: #4A9CEC}")
+            self.cancelButton.setParent(self.ui.dialogBackground)
+            self.cancelButton.clicked.connect(self.onCancel)
+            self.ui.verticalLayout.addWidget(self.cancelButton, 0, Qt.AlignRight)
+
+        self.cancelButton.show()
+
+    def onCancel(self):
+        if self.cancelMethod is not None:
+            self.cancelMethod()
+
     def setMinimum(self, value: int):
         self.ui.progressBar.setMinimum(value)
 
@@ -44,15 +89,41 @@ class ProgressDialog(QWidget):
         self.ui.progressBar.setMaximum(value)
 
     def setValue(self, value: int):
+        self.progressTimer.stop()
+        self.progress.reset(value)
         self.ui.progressBar.setValue(value)
 
     def addValue(self):
-        self.ui.progressBar.setValue(self.ui.progressBar.value() + 1)
+        self.progress.count += 1
+        self.ui.progressBar.setValue(self.progress.count)
+
+    def addProgress(self, content: str):
+        """Coalesced `addValue` + `setContent`, repainted at most `progress.rate` times per second"""
+        self.progress.add(content)
+
+        if self.progress.due():
+            self.updateProgress()
+        elif not self.progressTimer.isActive():
+            self.progressTimer.start(self.progress.interval())
+
+    def updateProgress(self):
+        if self.progress.changed():
+            snapshot = self.progress.snapshot()
+            self.ui.progressBar.setValue(snapshot["count"])
+            self._setContent(snapshot["item"])
 
     def setTitle(self, title: str):
         self.ui.title.setText(title)
 
     def setContent(self, content: str):
+        # Pending coalesced progress is older than this content
+        self.progressTimer.stop()
+        if self.progress.changed():
+            self.ui.progressBar.setValue(self.progress.snapshot()["count"])
+
+        self._setContent(content)
+
+    def _setContent(self, content: str):
         if self.ui.content.parent() is None:
             self.addContent()
 
@@ -0,0 +1,35 @@
+from typing import Callable, Collection
+
+from py7zr.callbacks import ExtractCallback
+
+
+class SevenZipProgress(ExtractCallback):
+    """
+    `progress(n, file)` is called when the n-th of `targets` starts extracting (on the py7zr reporter thread).
+    py7zr also reports members it skips while decompressing a solid block, those are ignored
+    """
+
+    def __init__(self, targets: Collection[str], progress: Callable[[int, str], None]):
+        self.targets = set(targets)
+        self.progress = progress
+        self.started = 0
+
+    def report_start_preparation(self):
+        pass
+
+    def report_start(self, processing_file_path, processing_bytes):
+        if processing_file_path in self.targets:
+            self.progress(self.started, processing_file_path)
+            self.started += 1
+
+    def report_update(self, decompressed_bytes):
+        pass
+
+    def report_end(self, processing_file_path, wrote_bytes):
+        pass
+
+    def report_warning(self, message):
+        pass
+
+    def report_postprocess(self):
+        pass
@@ -0,0 +1,109 @@
+import os
+import hashlib
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Set
+
+from .textformater import TextFormatter
+
+
+class DescriptionCache:
+    """
+    Formatted descriptions keyed by the hash of the raw text.
+    If `path` is set, rendered html is also stored there (one file per description) and reused across launches.
+    Files are written and pruned on a background thread, in the order they were requested
+    """
+
+    # Bump when TextFormatter output changes, so old files on disk are not used
+    formatVersion = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+
+        self.formatted: Dict[str, str] = {}
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DescriptionCache")
+
+        return self._executor
+
+    def key(self, description: str) -> str:
+        return hashlib.sha1(f"{self.formatVersion}\0{description}".encode("UTF-8", "surrogatepass")).hexdigest()
+
+    def format(self, description: str) -> str:
+        key = self.key(description)
+
+        formatted = self.formatted.get(key)
+        if formatted is not None:
+            return formatted
+
+        formatted = self._read(key)
+        if formatted is None:
+            formatted = TextFormatter.format(description)
+            if self.path is not None:
+                self.executor.submit(self._write, key, formatted)
+
+        self.formatted[key] = formatted
+        return formatted
+
+    def prune(self, descriptions: Iterable[str]):
+        """Forget formatted descriptions and remove files of all descriptions but `descriptions` (e.g. of loaded mods)"""
+        keys = {self.key(description) for description in descriptions}
+
+        # formatted is only used by the calling thread, the worker only removes files
+        for key in list(self.formatted):
+            if key not in keys:
+                del self.formatted[key]
+
+        if self.path is not None:
+            self.executor.submit(self._prune, keys)
+
+    def flush(self):
+        """Wait for pending writes and prunes"""
+        if self._executor is not None:
+            self._executor.submit(lambda: None).result()
+
+    def _read(self, key: str) -> Optional[str]:
+        if self.path is None:
+            return None
+
+        try:
+            with open(os.path.join(self.path, f"{key}.html"), "r", encoding="UTF-8") as file:
+                return file.read()
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, formatted: str):
+        filePath = os.path.join(self.path, f"{key}.html")
+        tempPath = f"{filePath}.tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tempPath, "w", encoding="UTF-8") as file:
+                file.write(formatted)
+            os.replace(tempPath, filePath)
+        except OSError:
+            print(f"Warning: Could not save description to {filePath}")
+
+    def _prune(self, keys: Set[str]):
+        try:
+            with os.scandir(self.path) as it:
+                names = [entry.name for entry in it if entry.is_file()]
+        except OSError:
+            return
+
+        for name in names:
+            # Left over temp files and html of descriptions no mod has anymore (or of an old formatVersion)
+            if name.endswith(".html") and name[:-len(".html")] in keys:
+                continue
+
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import builtins
+import contextlib
+import importlib.util
+
+from typing import List, Tuple, Dict
+
+
+DIAGNOSTICS_FLAG = "--diagnostics"
+
+
+class ImportTimer:
+    """
+    `-X importtime`-like report of the modules imported while the timer is running.
+    Only the first (real) import of a module is measured, nested imports are indented
+    """
+
+    def __init__(self):
+        # (module name, self time us, cumulative time us, depth)
+        self.records: List[Tuple[str, int, int, int]] = []
+
+        # Stack of children import times, per thread
+        self._local = threading.local()
+        self._import = None
+
+    def start(self):
+        if self._import is None:
+            self._import = builtins.__import__
+            builtins.__import__ = self._timedImport
+
+    def stop(self):
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    def _timedImport(self, name, globals=None, locals=None, fromlist=(), level=0):
+        try:
+            fullName = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__")) \
+                if level else name
+        except (ImportError, ValueError):
+            fullName = name
+
+        if fullName in sys.modules:
+            return self._import(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        depth = len(stack)
+        stack.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = (time.perf_counter_ns() - start) // 1000
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+
+            self.records.append((fullName, cumulative - children, cumulative, depth))
+
+    def report(self) -> str:
+        lines = ["import time: self [us] | cumulative | imported package"]
+
+        for name, selfTime, cumulative, depth in self.records:
+            lines.append(f"import time: {selfTime:>9} | {cumulative:>10} | {'  ' * depth}{name}")
+
+        lines.append("")
+        lines.append("Slowest imports (cumulative, top level):")
+        for name, selfTime, cumulative, depth in sorted((r for r in self.records if r[3] == 0),
+                                                        key=lambda r: r[2], reverse=True)[:15]:
+            lines.append(f"{cumulative / 1000:>10.1f} ms  {name}")
+
+        return "\n".join(lines) + "\n"
+
+
+class Timeline:
+    """Monotonic-clock timeline of named phases, exported in Chrome trace format (chrome://tracing, Perfetto)"""
+
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.events: List[dict] = []
+
+        self._begins: Dict[str, Tuple[float, int, dict]] = {}
+
+    def _now(self) -> float:
+        return (time.perf_counter_ns() - self.origin) / 1000
+
+    def begin(self, name: str, **args):
+        """Phase may end on another thread (e.g. answer from core handled on gui thread)"""
+        self._begins[name] = (self._now(), threading.get_ident(), args)
+
+    def end(self, name: str, **args):
+        begin = self._begins.pop(name, None)
+        if begin is None:
+            return
+
+        ts, tid, beginArgs = begin
+        self.events.append({"name": name, "cat": "startup", "ph": "X", "ts": ts, "dur": self._now() - ts,
+                            "pid": os.getpid(), "tid": tid, "args": {**beginArgs, **args}})
+
+    def instant(self, name: str, **args):
+        self.events.append({"name": name, "cat": "startup", "ph": "i", "s": "p", "ts": self._now(),
+                            "pid": os.getpid(), "tid": threading.get_ident(), "args": args})
+
+    @contextlib.contextmanager
+    def phase(self, name: str, **args):
+        self.begin(name, **args)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def trace(self) -> dict:
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+
+class Diagnostics:
+    enabled = False
+    path = os.path.join(os.getcwd(), "diagnostics")
+
+    importTimer = ImportTimer()
+    timeline = Timeline()
+
+    @classmethod
+    def init(cls, argv: List[str]):
+        """Enable diagnostics if `argv` contains the diagnostics flag (flag is removed from `argv`)"""
+        if DIAGNOSTICS_FLAG not in argv:
+            return
+
+        while DIAGNOSTICS_FLAG in argv:
+            argv.remove(DIAGNOSTICS_FLAG)
+
+        if cls.enabled:
+            return
+
+        cls.enabled = True
+        cls.importTimer.start()
+        atexit.register(cls.save)
+
+    @classmethod
+    def begin(cls, name: str, **args):
+        if cls.enabled:
+            cls.timeline.begin(name, **args)
+
+    @classmethod
+    def end(cls, name: str, **args):
+        if cls.enabled:
+            cls.timeline.end(name, **args)
+
+    @classmethod
+    def instant(cls, name: str, **args):
+        if cls.enabled:
+            cls.timeline.instant(name, **args)
+
+    @classmethod
+    def phase(cls, name: str, **args):
+        if cls.enabled:
+            return cls.timeline.phase(name, **args)
+
+        return contextlib.nullcontext()
+
+    @classmethod
+    def saveTimeline(cls):
+        if not cls.enabled:
+            return
+
+        try:
+            os.makedirs(cls.path, exist_ok=True)
+            with open(os.path.join(cls.path, "startup_trace.json"), "w", encoding="UTF-8") as file:
+                json.dump(cls.timeline.trace(), file)
+        except OSError:
+            print(f"Warning: Could not save diagnostics to {cls.path}")
+
+    @classmethod
+    def save(cls):
+        cls.importTimer.stop()
+        cls.saveTimeline()
+
+        try:
+            os.makedirs(cls.path, exist_ok=True)
+            with open(os.path.join(cls.path, "importtime.txt"), "w", encoding="UTF-8") as file:
+                file.write(cls.importTimer.report())
+        except OSError:
+            print(f"Warning: Could not save diagnostics to {cls.path}")
@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import threading
+
+from typing import Callable, Optional
+
+
+class IncompleteDownload(Exception):
+    pass
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+class Downloader:
+    """
+    Downloads over one shared `requests.Session`, connections are kept alive and reused by parallel jobs.
+    Chunk size adapts to the connection speed: it grows while chunks arrive fast and shrinks when they are slow,
+    so progress is reported a few times per second on both slow and fast connections
+    """
+
+    minChunkSize = 64 * 1024
+    maxChunkSize = 4 * 1024 * 1024
+
+    # Seconds per chunk the chunk size is adjusted to
+    fastChunkTime = 0.05
+    slowChunkTime = 0.25
+
+    def __init__(self, poolSize: int = 4, timeout: float = 30, retries: int = 4, backoff: float = 1):
+        self.poolSize = poolSize
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # requests is imported on the first download
+        with self._lock:
+            if self._session is None:
+                import requests
+                # (https://stackoverflow.com/questions/9144724/unknown-encoding-idna-in-python-requests)
+                import encodings.idna
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.poolSize, pool_maxsize=self.poolSize)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+
+                self._session = session
+
+        return self._session
+
+    def download(self, url: str, path: str, progress: Optional[Callable[[int, int], None]] = None,
+                 cancelEvent: Optional[threading.Event] = None) -> dict:
+        """
+        Download `url` to `path`, `progress(downloaded, total)` is called after every chunk (total is 0 if unknown).
+        Dropped connections are retried with exponential backoff, DownloadCancelled is raised as soon as `cancelEvent`
+        is set during the backoff. The partial file is kept on failure and the next download to the same `path`
+        resumes it, if the server still has the same file (ETag / Last-Modified).
+        Returns validators of the downloaded file: {"etag", "lastModified"}
+        """
+        attempt = 0
+
+        while True:
+            try:
+                return self._download(url, path, progress)
+            except Exception as e:
+                if attempt >= self.retries or not self._retryable(e):
+                    raise
+
+            delay = self.backoff * 2 ** attempt
+            if cancelEvent is None:
+                time.sleep(delay)
+            elif cancelEvent.wait(delay):
+                raise DownloadCancelled(url)
+            attempt += 1
+
+    @staticmethod
+    def _retryable(e: Exception) -> bool:
+        import requests
+        import urllib3
+
+        if isinstance(e, requests.HTTPError):
+            return e.response is not None and e.response.status_code >= 500
+
+        return isinstance(e, (IncompleteDownload, requests.ConnectionError, requests.Timeout,
+                              requests.exceptions.ChunkedEncodingError, urllib3.exceptions.HTTPError))
+
+    @staticmethod
+    def _readMeta(metaPath: str) -> dict:
+        try:
+            with open(metaPath, "r", encoding="UTF-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _writeMeta(metaPath: str, meta: dict):
+        with open(metaPath, "w", encoding="UTF-8") as file:
+            json.dump(meta, file)
+
+    @staticmethod
+    def _remove(*paths: str):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _download(self, url: str, path: str, progress: Optional[Callable[[int, int], None]]):
+        metaPath = f"{path}.meta"
+        meta = self._readMeta(metaPath)
+
+        # Ranges are byte ranges of the encoded body, so the body is requested as is
+        headers = {"Accept-Encoding": "identity"}
+
+        offset = os.path.getsize(path) if os.path.exists(path) else 0
+        # Weak ETags can't be used in If-Range
+        etag = meta.get("etag")
+        validator = etag if etag and not etag.startswith("W/") else meta.get("lastModified")
+        if offset and validator and meta.get("url") == url:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        else:
+            offset = 0
+
+        with self.session.get(url, stream=True, timeout=self.timeout, headers=headers) as r:
+            if r.status_code == 416:
+                # Saved part doesn't fit the file on the server anymore, start again
+                self._remove(path, metaPath)
+                raise IncompleteDownload(url)
+
+            r.raise_for_status()
+            length = int(r.headers.get("Content-Length") or 0)
+
+            if r.status_code == 206:
+                if not r.headers.get("Content-Range", "").startswith(f"bytes {offset}-"):
+                    self._remove(path, metaPath)
+                    raise IncompleteDownload(f"{url}: unexpected range {r.headers.get('Content-Range')}")
+                mode = "ab"
+            else:
+                # Server sent the whole file (file changed or ranges are not supported)
+                offset = 0
+                mode = "wb"
+
+            total = offset + length if length else 0
+
+            validators = {"etag": r.headers.get("ETag", meta.get("etag") if offset else None),
+                          "lastModified": r.headers.get("Last-Modified", meta.get("lastModified") if offset else None)}
+            self._writeMeta(metaPath, {"url": url, **validators})
+
+            with open(path, mode) as file:
+                downloaded = self._readTo(r, file, offset, total, progress)
+
+        if total and downloaded < total:
+            raise IncompleteDownload(f"{url}: {downloaded} of {total} bytes")
+
+        self._remove(metaPath)
+        return validators
+
+    def notModified(self, url: str, etag: Optional[str], lastModified: Optional[str]) -> bool:
+        """Conditional request, True if the server answers that the file with these validators is still current"""
+        headers = {"Accept-Encoding": "identity"}
+        if etag:
+            headers["If-None-Match"] = etag
+        if lastModified:
+            headers["If-Modified-Since"] = lastModified
+
+        # Body (if any) is not read, the connection is just closed
+        with self.session.get(url, stream=True, timeout=self.timeout, headers=headers) as r:
+            return r.status_code == 304
+
+    def _readTo(self, response, file, downloaded: int, total: int,
+                progress: Optional[Callable[[int, int], None]]) -> int:
+        chunkSize = self.minChunkSize
+
+        while True:
+            start = time.perf_counter()
+            chunk = response.raw.read(chunkSize, decode_content=True)
+            if not chunk:
+                break
+
+            file.write(chunk)
+            downloaded += len(chunk)
+
+            elapsed = time.perf_counter() - start
+            if elapsed < self.fastChunkTime:
+                chunkSize = min(chunkSize * 2, self.maxChunkSize)
+            elif elapsed > self.slowChunkTime:
+                chunkSize = max(chunkSize // 2, self.minChunkSize)
+
+            if progress is not None:
+                progress(downloaded, total)
+
+        return downloaded
@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from typing import Dict, Optional
+
+
+class DownloadCache:
+    """
+    Downloaded archives keyed by GameBanana dlId, stored once per content (sha256) in `path`.
+    Entries keep ETag / Last-Modified for revalidation, least recently used archives are removed
+    when the cache grows over `maxBytes`. Archives returned by `acquire` and `put` are pinned: they are not
+    removed until `release`, so other jobs can't evict an archive that is being extracted.
+    Partial downloads (`<dlId>.part` and its `.meta`) are removed by `prune`
+    """
+
+    hashChunkSize = 1024 * 1024
+    # Partial downloads not resumed for this long are removed by prune
+    partMaxAge = 7 * 24 * 60 * 60
+
+    def __init__(self, path: str, maxBytes: int):
+        self.path = path
+        self.maxBytes = maxBytes
+        self.indexPath = os.path.join(path, "index.json")
+
+        # dlId -> {"sha256", "size", "url", "etag", "lastModified", "used"}
+        self._entries: Optional[Dict[str, dict]] = None
+        # sha256 -> number of jobs using the archive
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def entries(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.indexPath, "r", encoding="UTF-8") as file:
+                    self._entries = json.load(file)
+            except (OSError, ValueError):
+                self._entries = {}
+
+        return self._entries
+
+    def _save(self):
+        tempPath = f"{self.indexPath}.tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tempPath, "w", encoding="UTF-8") as file:
+                json.dump(self.entries, file, indent=4)
+            os.replace(tempPath, self.indexPath)
+        except OSError:
+            print(f"Warning: Could not save download cache index to {self.indexPath}")
+
+    def archivePath(self, sha256: str) -> str:
+        return os.path.join(self.path, f"{sha256}.archive")
+
+    def partPath(self, dlId: str) -> str:
+        """Path to download `dlId` to, kept in the cache folder so finished downloads are moved, not copied"""
+        os.makedirs(self.path, exist_ok=True)
+        return os.path.join(self.path, f"{dlId}.part")
+
+    def get(self, dlId: str) -> Optional[dict]:
+        """Entry of `dlId` if its archive is still in the cache"""
+        with self._lock:
+            entry = self.entries.get(dlId)
+            if entry is None:
+                return None
+
+            try:
+                if os.path.getsize(self.archivePath(entry["sha256"])) == entry["size"]:
+                    return dict(entry)
+            except OSError:
+                pass
+
+            del self.entries[dlId]
+            self._save()
+            return None
+
+    def acquire(self, dlId: str) -> Optional[dict]:
+        """Entry of `dlId` with its archive pinned until `release(entry)`, None if it is not cached"""
+        with self._lock:
+            entry = self.get(dlId)
+            if entry is not None:
+                self._pins[entry["sha256"]] = self._pins.get(entry["sha256"], 0) + 1
+
+            return entry
+
+    def release(self, entry: dict):
+        """Unpin archive of an entry from `acquire` / `put`, eviction that waited for it runs now"""
+        sha256 = entry["sha256"]
+
+        with self._lock:
+            self._pins[sha256] -= 1
+            if self._pins[sha256]:
+                return
+
+            del self._pins[sha256]
+            # Archive may have been replaced or evicted while pinned
+            self._removeArchive(sha256)
+            self._evict()
+            self._save()
+
+    def touch(self, dlId: str):
+        with self._lock:
+            if dlId in self.entries:
+                self.entries[dlId]["used"] = time.time()
+                self._save()
+
+    @classmethod
+    def sha256(cls, filePath: str) -> str:
+        sha256 = hashlib.sha256()
+        with open(filePath, "rb") as file:
+            while chunk := file.read(cls.hashChunkSize):
+                sha256.update(chunk)
+
+        return sha256.hexdigest()
+
+    def put(self, dlId: str, url: str, filePath: str, etag: str = None, lastModified: str = None) -> dict:
+        """Move downloaded `filePath` into the cache, return the new entry with its archive pinned until `release`"""
+        sha256 = self.sha256(filePath)
+        size = os.path.getsize(filePath)
+        archivePath = self.archivePath(sha256)
+
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            if os.path.exists(archivePath):
+                # Same content is already cached (e.g. under another dlId)
+                os.remove(filePath)
+            else:
+                os.replace(filePath, archivePath)
+
+            old = self.entries.get(dlId)
+            entry = self.entries[dlId] = {"sha256": sha256, "size": size, "url": url,
+                                          "etag": etag, "lastModified": lastModified, "used": time.time()}
+            self._pins[sha256] = self._pins.get(sha256, 0) + 1
+
+            if old is not None and old["sha256"] != sha256:
+                self._removeArchive(old["sha256"])
+
+            self._evict()
+            self._save()
+
+            return dict(entry)
+
+    def prune(self):
+        """
+        Remove partial downloads older than `partMaxAge`, then the oldest ones while archives and partial downloads
+        together are over `maxBytes`. Called on startup, when nothing is being downloaded
+        """
+        # Part path -> (last modification of the part or its meta, bytes of both)
+        parts = {}
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if entry.name.endswith(".part.meta"):
+                        part = entry.path[:-len(".meta")]
+                    elif entry.name.endswith(".part"):
+                        part = entry.path
+                    else:
+                        continue
+
+                    stat = entry.stat()
+                    mtime, size = parts.get(part, (0, 0))
+                    parts[part] = (max(mtime, stat.st_mtime), size + stat.st_size)
+        except OSError:
+            return
+
+        with self._lock:
+            sizes = {entry["sha256"]: entry["size"] for entry in self.entries.values()}
+            total = sum(sizes.values()) + sum(size for _, size in parts.values())
+            now = time.time()
+
+            for part, (mtime, size) in sorted(parts.items(), key=lambda item: item[1][0]):
+                if now - mtime < self.partMaxAge and total <= self.maxBytes:
+                    break
+
+                for path in (part, f"{part}.meta"):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+                total -= size
+
+    def _evict(self):
+        sizes = {entry["sha256"]: entry["size"] for entry in self.entries.values()}
+        total = sum(sizes.values())
+
+        for dlId, entry in sorted(self.entries.items(), key=lambda item: item[1]["used"]):
+            if total <= self.maxBytes:
+                break
+
+            # Pinned archives are being extracted, they are evicted on release if still needed
+            if entry["sha256"] in self._pins:
+                continue
+
+            del self.entries[dlId]
+
+            if self._removeArchive(entry["sha256"]):
+                total -= sizes[entry["sha256"]]
+
+    def _removeArchive(self, sha256: str) -> bool:
+        """Archive is removed with the last entry referring to it, pinned archives are removed on release"""
+        if sha256 in self._pins or any(entry["sha256"] == sha256 for entry in self.entries.values()):
+            return False
+
+        try:
+            os.remove(self.archivePath(sha256))
+        except OSError:
+            pass
+
+        return True
@@ -0,0 +1,64 @@
+import os
+
+from typing import Callable, Optional, Iterable
+
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def FreeFileName(dirPath: str, fileName: str, reserved: Iterable[str] = ()) -> str:
+    """
+    `fileName` or first free `name (i).ext` in `dirPath`, names are taken from a single directory listing.
+    `reserved` names are treated as taken (e.g. files being written by other imports)
+    """
+    names = {os.path.normcase(name) for name in reserved}
+    try:
+        names.update(os.path.normcase(name) for name in os.listdir(dirPath))
+    except OSError:
+        pass
+
+    if os.path.normcase(fileName) not in names:
+        return fileName
+
+    name, ext = os.path.splitext(fileName)
+
+    i = 1
+    while os.path.normcase(f"{name} ({i}){ext}") in names:
+        i += 1
+
+    return f"{name} ({i}){ext}"
+
+
+def CopyFile(src: str, dst: str, progress: Optional[Callable[[int, int], None]] = None,
+             chunkSize: int = COPY_CHUNK_SIZE):
+    """
+    Stream `src` into a temp file next to `dst` and rename it to `dst`, so `dst` never exists half written.
+    `progress(copied, total)` is called after every chunk
+    """
+    total = os.path.getsize(src)
+    tempPath = f"{dst}.part"
+
+    try:
+        with open(src, "rb") as srcFile, open(tempPath, "wb") as dstFile:
+            buffer = bytearray(chunkSize)
+            view = memoryview(buffer)
+            copied = 0
+
+            while True:
+                size = srcFile.readinto(buffer)
+                if not size:
+                    break
+
+                dstFile.write(view[:size])
+                copied += size
+
+                if progress is not None:
+                    progress(copied, total)
+
+        os.replace(tempPath, dst)
+    except BaseException:
+        try:
+            os.remove(tempPath)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,154 @@
+import threading
+import itertools
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class ImportJobState:
+    QUEUED = "queued"
+    DOWNLOADING = "downloading"
+    EXTRACTING = "extracting"
+    COPYING = "copying"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+class ImportJob:
+    _ids = itertools.count(1)
+
+    def __init__(self, manager: "ImportJobManager", name: str, target: Callable[["ImportJob"], None]):
+        self.id = next(self._ids)
+        self.name = name
+        self.target = target
+
+        self.manager = manager
+        self.state = ImportJobState.QUEUED
+        self.content = ""
+        self.value = 0
+        self.maximum = 0
+        self.error: Optional[BaseException] = None
+
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def cancelEvent(self) -> threading.Event:
+        """Set when the job is cancelled, waits of the job can be woken up by it"""
+        return self._cancelled
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def checkCancelled(self):
+        """Called by the job between steps, stops the job if it was cancelled"""
+        if self._cancelled.is_set():
+            raise ImportCancelled(self.name)
+
+    def setState(self, state: str, content: str = ""):
+        self.state = state
+        self.content = content
+        self.value = self.maximum = 0
+        self.manager._update(self)
+
+    def setProgress(self, value: int, maximum: int, content: Optional[str] = None):
+        self.checkCancelled()
+
+        # Updates are reported only when the whole percent or the content changes, not for every chunk
+        changed = (content is not None and content != self.content) or \
+                  (maximum != self.maximum) or \
+                  (maximum and value * 100 // maximum != self.value * 100 // maximum)
+
+        self.value = value
+        self.maximum = maximum
+        if content is not None:
+            self.content = content
+
+        if changed:
+            self.manager._update(self)
+
+    def snapshot(self) -> dict:
+        return {"id": self.id, "name": self.name, "state": self.state, "content": self.content,
+                "value": self.value, "maximum": self.maximum, "error": self.error}
+
+
+class ImportJobManager:
+    """
+    Runs import jobs on a bounded thread pool.
+    `onUpdate(snapshot)` is called on state and progress changes and `onIdle(snapshots)` once all submitted jobs
+    finished, both from worker threads (pass QExecMainThread methods to get them on the gui thread)
+    """
+
+    def __init__(self, maxWorkers: int = 2,
+                 onUpdate: Callable[[dict], None] = None,
+                 onIdle: Callable[[List[dict]], None] = None):
+        self.onUpdate = onUpdate
+        self.onIdle = onIdle
+
+        self.executor = ThreadPoolExecutor(max_workers=maxWorkers, thread_name_prefix="ImportJob")
+        self.jobs: Dict[int, ImportJob] = {}
+
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, target: Callable[[ImportJob], None]) -> ImportJob:
+        return self.submitAll([(name, target)])[0]
+
+    def submitAll(self, items: Iterable[Tuple[str, Callable[[ImportJob], None]]]) -> List[ImportJob]:
+        """
+        Submit (name, target) jobs as one batch, all of them are registered before any starts,
+        so `onIdle` is not called between jobs of the batch
+        """
+        jobs = [ImportJob(self, name, target) for name, target in items]
+
+        with self._lock:
+            for job in jobs:
+                self.jobs[job.id] = job
+
+        for job in jobs:
+            self._update(job)
+            self.executor.submit(self._run, job)
+
+        return jobs
+
+    def active(self) -> List[ImportJob]:
+        with self._lock:
+            return [job for job in self.jobs.values() if job.state not in ImportJobState.FINISHED]
+
+    def cancelAll(self):
+        for job in self.active():
+            job.cancel()
+
+    def _update(self, job: ImportJob):
+        if self.onUpdate is not None:
+            self.onUpdate(job.snapshot())
+
+    def _run(self, job: ImportJob):
+        try:
+            job.checkCancelled()
+            job.target(job)
+            job.setState(ImportJobState.DONE)
+        except ImportCancelled:
+            job.setState(ImportJobState.CANCELLED)
+        except Exception as e:
+            job.error = e
+            job.setState(ImportJobState.FAILED, str(e))
+
+        with self._lock:
+            if any(_job.state not in ImportJobState.FINISHED for _job in self.jobs.values()):
+                return
+
+            finished = [_job.snapshot() for _job in self.jobs.values()]
+            self.jobs.clear()
+
+        if self.onIdle is not None:
+            self.onIdle(finished)
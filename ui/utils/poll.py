@@ -0,0 +1,30 @@
+import time
+
+from typing import Callable, Iterator, Optional
+
+
+# Core data is polled with a non-blocking read (core.Controller has no blocking one), the interval backs off while
+# the core is idle: a message waits at most POLL_MAX, an idle core costs about 1 / POLL_MAX wakeups per second of the
+# listener thread, the gui thread only wakes up for data
+POLL_MIN = 0.001
+POLL_MAX = 0.005
+
+
+def PollData(read: Callable[[], object], deadline: Optional[float] = None,
+             minWait: float = POLL_MIN, maxWait: float = POLL_MAX) -> Iterator:
+    """
+    Yield every result of `read()` that is not None, sleeping from `minWait` to `maxWait` (doubled per empty read)
+    while there is none. Stops when `time.monotonic()` passes `deadline`
+    """
+    wait = minWait
+
+    while deadline is None or time.monotonic() < deadline:
+        data = read()
+
+        if data is None:
+            time.sleep(wait if deadline is None else max(0, min(wait, deadline - time.monotonic())))
+            wait = min(wait * 2, maxWait)
+            continue
+
+        wait = minWait
+        yield data
@@ -0,0 +1,197 @@
+import os
+import threading
+import collections
+
+from typing import Set, Optional, Tuple, Union
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QThread, Signal
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+
+class PreviewCache:
+    """
+    LRU cache of decoded previews (QImage or QPixmap) limited by size in bytes (width * height * depth).
+    Entries are invalidated when the file changes (size or modification time)
+    """
+
+    def __init__(self, maxBytes: int = 128 * 1024 * 1024):
+        self.maxBytes = maxBytes
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # path -> (preview, file key, size in bytes)
+        self.entries = collections.OrderedDict()
+
+    @staticmethod
+    def fileKey(path: str) -> Optional[Tuple[int, int]]:
+        if path.startswith(":"):
+            # Qt resource, never changes
+            return None
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def sizeOf(preview: Union[QImage, QPixmap]) -> int:
+        return preview.width() * preview.height() * preview.depth() // 8
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.entries
+
+    def isFull(self) -> bool:
+        return self.bytes >= self.maxBytes
+
+    def get(self, path: str) -> Optional[Union[QImage, QPixmap]]:
+        entry = self.entries.get(path, None)
+
+        if entry is not None and entry[1] != self.fileKey(path):
+            self.invalidate(path)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(path)
+        return entry[0]
+
+    def put(self, path: str, preview: Union[QImage, QPixmap], key: Tuple[int, int] = None):
+        self.invalidate(path)
+
+        size = self.sizeOf(preview)
+        self.entries[path] = (preview, self.fileKey(path) if key is None else key, size)
+        self.bytes += size
+
+        # The newest entry stays even if it alone is bigger than the budget
+        while self.bytes > self.maxBytes and len(self.entries) > 1:
+            _, (_, _, evictedSize) = self.entries.popitem(last=False)
+            self.bytes -= evictedSize
+            self.evictions += 1
+
+    def invalidate(self, path: str):
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "bytes": self.bytes, "maxBytes": self.maxBytes,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+class _DecoderSignals(QObject):
+    decoded = Signal(str, QImage, object, int)
+    dropped = Signal(str)
+
+
+class _PreviewDecoder(QRunnable):
+    def __init__(self, path: str, loader: "PreviewLoader"):
+        super().__init__()
+
+        self.path = path
+        self.loader = loader
+
+    def run(self):
+        path = self.path.replace("\\", "/")
+
+        # Header only, the size is known before decoding
+        size = QImageReader(path).size()
+        reserved = max(0, size.width() * size.height() * 4)
+
+        if not self.loader._reserve(self.path, reserved):
+            self.loader._signals.dropped.emit(self.path)
+            return
+
+        # Key is taken before decoding, so a file changed meanwhile is decoded again later
+        key = PreviewCache.fileKey(self.path)
+        # QImage (unlike QPixmap) can be created outside of the gui thread
+        self.loader._signals.decoded.emit(self.path, QImage(path), key, reserved)
+
+
+class PreviewLoader(QObject):
+    """
+    Decodes preview images into `cache` on a worker pool, `loaded(path)` is emitted in the gui thread.
+    Prefetched previews are dropped by the worker, before decoding, when they don't fit in the free space of the cache
+    """
+
+    loaded = Signal(str)
+
+    def __init__(self, cache: PreviewCache, maxThreads: int = None):
+        super().__init__()
+
+        self.cache = cache
+        self.pending: Set[str] = set()
+
+        # Pending prefetches (dropped when the cache is full) and bytes of previews being decoded, used by workers
+        self._lock = threading.Lock()
+        self._prefetching: Set[str] = set()
+        self._reserved = 0
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(maxThreads or max(1, QThread.idealThreadCount() - 1))
+
+        self._signals = _DecoderSignals()
+        self._signals.decoded.connect(self._decoded)
+        self._signals.dropped.connect(self._dropped)
+
+    def request(self, path: str):
+        if path in self.cache:
+            return
+
+        with self._lock:
+            # A requested preview is decoded even if it was only prefetched so far
+            self._prefetching.discard(path)
+
+        if path not in self.pending:
+            self.pending.add(path)
+            self.pool.start(_PreviewDecoder(path, self))
+
+    def prefetch(self, path: str):
+        """Request decoding only while the cache has free space, checked again before decoding"""
+        if path not in self.cache and path not in self.pending and not self.cache.isFull():
+            with self._lock:
+                self._prefetching.add(path)
+
+            self.pending.add(path)
+            self.pool.start(_PreviewDecoder(path, self))
+
+    def _reserve(self, path: str, size: int) -> bool:
+        """Called by workers, False if prefetched path doesn't fit next to the cache and previews being decoded"""
+        with self._lock:
+            if path in self._prefetching and self.cache.bytes + self._reserved + size > self.cache.maxBytes:
+                return False
+
+            self._reserved += size
+            return True
+
+    def _decoded(self, path: str, image: QImage, key, reserved: int):
+        with self._lock:
+            self._reserved -= reserved
+            self._prefetching.discard(path)
+
+        if path in self.pending:
+            self.pending.discard(path)
+            self.cache.put(path, image, key)
+            self.loaded.emit(path)
+
+    def _dropped(self, path: str):
+        with self._lock:
+            prefetched = path in self._prefetching
+            self._prefetching.discard(path)
+
+        self.pending.discard(path)
+
+        # Requested while the worker was dropping it
+        if not prefetched:
+            self.request(path)
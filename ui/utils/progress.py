@@ -0,0 +1,49 @@
+import time
+
+
+class ProgressCounter:
+    """
+    Aggregates per-element progress (sprites, sounds, files) into snapshots,
+    so that consumers are updated at most `rate` times per second
+    """
+
+    def __init__(self, rate: int = 30):
+        self.rate = rate
+
+        self.count = 0
+        self.item = ""
+        self.startTime = time.monotonic()
+
+        self._changed = False
+        self._lastSnapshot = 0.0
+
+    def reset(self, count: int = 0):
+        self.count = count
+        self.item = ""
+        self.startTime = time.monotonic()
+
+        self._changed = False
+        self._lastSnapshot = 0.0
+
+    def add(self, item: str, count: int = 1):
+        self.count += count
+        self.item = item
+        self._changed = True
+
+    def changed(self) -> bool:
+        return self._changed
+
+    def due(self) -> bool:
+        return self._changed and time.monotonic() - self._lastSnapshot >= 1 / self.rate
+
+    def interval(self) -> int:
+        """Minimal time between snapshots in milliseconds"""
+        return int(1000 / self.rate)
+
+    def snapshot(self) -> dict:
+        self._changed = False
+        self._lastSnapshot = time.monotonic()
+
+        return {"count": self.count,
+                "item": self.item,
+                "elapsed": round(self._lastSnapshot - self.startTime, 3)}
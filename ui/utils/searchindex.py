@@ -0,0 +1,97 @@
+import bisect
+
+from typing import List, Tuple, Dict, Set, Optional, Iterable
+
+
+class SearchIndex:
+    """
+    Sorted token index for the mods search.
+    Single word queries are prefix lookups (binary search) over words of name and author, game version and tags.
+    Queries with spaces intersect the prefix lookups of their words, only these candidates are checked for
+    the whole query in name or author (words at word starts); game version and tags are matched by prefix
+    """
+
+    def __init__(self):
+        # Sorted (token, key)
+        self.tokens: List[Tuple[str, str]] = []
+        self.entries: Dict[str, dict] = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _entry(self, key: str, name: str, author: str, gameVersion: str, tags: List[str]) -> dict:
+        if key in self.entries:
+            self.remove(key)
+
+        name = f" {name.lower()}"
+        author = f" {author.lower()}"
+        tags = [tag.casefold().lower() for tag in tags]
+
+        tokens = {word for word in name.split(" ") + author.split(" ") if word}
+        tokens.update(tag for tag in tags if tag)
+        if gameVersion:
+            tokens.add(gameVersion)
+
+        entry = self.entries[key] = {"name": name, "author": author, "gameVersion": gameVersion, "tags": tags,
+                                     "tokens": tokens}
+        return entry
+
+    def add(self, key: str, name: str, author: str, gameVersion: str, tags: List[str]):
+        for token in self._entry(key, name, author, gameVersion, tags)["tokens"]:
+            bisect.insort(self.tokens, (token, key))
+
+    def update(self, items: Iterable[Tuple[str, str, str, str, List[str]]]):
+        """Bulk `add` of (key, name, author, gameVersion, tags), tokens are sorted once"""
+        for key, name, author, gameVersion, tags in items:
+            self.tokens.extend((token, key) for token in self._entry(key, name, author, gameVersion, tags)["tokens"])
+
+        self.tokens.sort()
+
+    def remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+
+        for token in entry["tokens"]:
+            i = bisect.bisect_left(self.tokens, (token, key))
+            if i < len(self.tokens) and self.tokens[i] == (token, key):
+                del self.tokens[i]
+
+    def clear(self):
+        self.tokens.clear()
+        self.entries.clear()
+
+    def prefix(self, prefix: str) -> Set[str]:
+        # Every token starting with prefix sorts before prefix followed by the last code point
+        start = bisect.bisect_left(self.tokens, (prefix, ""))
+        end = bisect.bisect_left(self.tokens, (prefix + "\U0010ffff", ""), start)
+
+        return {key for _, key in self.tokens[start:end]}
+
+    def search(self, text: str) -> Optional[Set[str]]:
+        """Keys of matching entries, None if every entry matches (empty query)"""
+        text = text.casefold()
+        stripped = text.strip()
+
+        if not stripped:
+            return None
+
+        if len(text.split(" ")) == 1:
+            return self.prefix(text)
+
+        # Smallest range first, the intersection only gets smaller
+        candidates = None
+        for keys in sorted((self.prefix(word) for word in stripped.split()), key=len):
+            candidates = keys if candidates is None else candidates & keys
+            if not candidates:
+                break
+
+        found = {key for key in candidates
+                 if text in self.entries[key]["name"] or text in self.entries[key]["author"]}
+
+        # Tags and game versions are whole tokens and may contain spaces
+        found.update(key for key in self.prefix(stripped)
+                     if self.entries[key]["gameVersion"].startswith(stripped) or
+                     any(tag.startswith(stripped) for tag in self.entries[key]["tags"]))
+
+        return found
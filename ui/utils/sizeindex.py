@@ -0,0 +1,133 @@
+import os
+import time
+
+from typing import Dict, Tuple
+
+
+class FileSizeIndex:
+    """
+    Sizes of files and folders under `root`, filled by a single recursive `os.scandir` pass,
+    folders store the total size of their files.
+    A file lookup costs one `os.stat`, its (st_size, st_mtime_ns) is compared with the stored one, so a file
+    overwritten in place gets its new size (and the totals of its folders follow).
+    Mtimes of the scanned folders are kept, the index is scanned again once one of them changed (a file was added,
+    removed or replaced), this is checked at most once per `validateInterval` seconds
+    """
+
+    validateInterval = 1.0
+
+    def __init__(self, root: str):
+        self.root = root
+
+        self.entries: Dict[str, int] = {}
+        # File key -> (st_size, st_mtime_ns) of its size in entries
+        self.files: Dict[str, Tuple[int, int]] = {}
+        # Folder path -> st_mtime_ns at the scan
+        self.folders: Dict[str, int] = {}
+        self.scanned = False
+        self.validated = 0.0
+
+    @staticmethod
+    def key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _scan(self, path: str) -> int:
+        total = 0
+
+        try:
+            # Taken before the listing, a change during the scan is found by the next check
+            self.folders[path] = os.stat(path).st_mtime_ns
+
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            total += self._scan(entry.path)
+                        elif entry.is_file():
+                            # On Windows stat comes with the directory listing
+                            stat = entry.stat()
+                            key = self.key(entry.path)
+                            self.entries[key] = stat.st_size
+                            self.files[key] = (stat.st_size, stat.st_mtime_ns)
+                            total += stat.st_size
+                    except OSError:
+                        continue
+
+            self.entries[self.key(path)] = total
+        except OSError:
+            pass
+
+        return total
+
+    def scan(self):
+        self.entries.clear()
+        self.files.clear()
+        self.folders.clear()
+        self._scan(self.root)
+        self.scanned = True
+        self.validated = time.monotonic()
+
+    def invalidate(self):
+        """Scan again on the next lookup (e.g. after mods were reloaded)"""
+        self.scanned = False
+
+    def changed(self) -> bool:
+        """True if a scanned folder changed since the scan, one stat per folder"""
+        now = time.monotonic()
+        if now - self.validated < self.validateInterval:
+            return False
+        self.validated = now
+
+        for path, mtime in self.folders.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+
+        return False
+
+    def _resize(self, key: str, delta: int):
+        """Add `delta` to the totals of the folders containing the file `key`"""
+        folder = os.path.dirname(key)
+
+        while folder in self.entries and folder not in self.files:
+            self.entries[folder] += delta
+
+            parent = os.path.dirname(folder)
+            if parent == folder:
+                break
+            folder = parent
+
+    def size(self, path: str) -> int:
+        if not self.scanned or self.changed():
+            self.scan()
+
+        key = self.key(path)
+        size = self.entries.get(key, None)
+
+        if size is not None and key not in self.files:
+            # Folder
+            return size
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Removed
+            if size is not None:
+                self._resize(key, -size)
+                del self.entries[key], self.files[key]
+            return 0
+
+        fileKey = (stat.st_size, stat.st_mtime_ns)
+
+        if fileKey != self.files.get(key, None):
+            # Overwritten in place (the folder mtime stays) or not scanned (outside of root)
+            if size is not None:
+                self._resize(key, stat.st_size - size)
+
+            self.entries[key] = stat.st_size
+            self.files[key] = fileKey
+            size = stat.st_size
+
+        return size
@@ -69,6 +69,87 @@ class TextFormatter:
 
         return f"<table>{n}{ret}</table>"
 
+    # Tag -> html, tags with a value are formatted with it
+    htmlMap = {
+        "size": "<span style=\"font-size:{}\">",
+        "color": "<span style=\"color:{}\">",
+        "bgcolor": "<span style=\"background-color:{}\">",
+        "url": "<a href=\"{0}\" style=\"text-decoration: none; color:#3498db\" title=\"{0}\">",
+        "/url": "</a>",
+        "tooltip": "<span title=\"{}\">",
+        "b": "<strong>",
+        "/b": "</strong>",
+        "i": "<em>",
+        "/i": "</em>",
+        "u": "<u>",
+        "/u": "</u>",
+        "s": "<s>",
+        "/s": "</s>",
+        "sup": "<sup>",
+        "/sup": "</sup>",
+        "sub": "<sub>",
+        "/sub": "</sub>",
+        "center": "<p style=\"text-align:center\">",
+        "right": "<p style=\"text-align:right\">",
+        "nlist": "<ol>",
+        "/nlist": "</ol>",
+        "plist": "<ul>",
+        "/plist": "</ul>",
+        "el": "<li>",
+        "/el": "</li>",
+        "tab": "&nbsp;"*4,
+        "table": "<table width=\"100%\">",
+        "/table": "</table>",
+        "tr": "<tr>",
+        "/tr": "</tr>",
+        "td": "<td>",
+        "/td": "</td>",
+        "/size": "</span>",
+        "/color": "</span>",
+        "/tooltip": "</span>",
+        "/bgcolor": "</span>",
+        "/center": "</p>",
+        "/right": "</p>",
+    }
+
+    paragraphRegular = re.compile(r"\n(?!<el>|<plist>|<\/plist>|<nlist>|<\/nlist>)")
+    splitRegular = re.compile(r'(\<.*?\>)')
+
+    compiledMap = {tag: re.compile(regular) for tag, regular in regularMap.items()}
+    # Tag segments are "<...>" with a single ">", so a segment with a single "<" can match only one tag, as a whole
+    tagsRegular = re.compile("|".join(f"(?P<t{n}>{regular})" for n, regular in enumerate(regularMap.values())))
+    tagsGroups = {f"t{n}": (tag, re.compile(regular).groups) for n, (tag, regular) in enumerate(regularMap.items())}
+
+    @classmethod
+    def formatTag(cls, tag: str, value: str) -> str:
+        if tag == "size":
+            value = value.casefold()
+            if not value:
+                return ""
+
+        return cls.htmlMap.get(tag, "").format(value)
+
+    @classmethod
+    def replaceTag(cls, segment: str) -> str:
+        if segment.count("<") == 1:
+            match = cls.tagsRegular.fullmatch(segment)
+            if match is None:
+                return segment
+
+            tag, groups = cls.tagsGroups[match.lastgroup]
+            value = match.group(match.re.groupindex[match.lastgroup] + 1) if groups else match.group()
+        else:
+            # First tag (in regularMap order) found anywhere in the segment
+            for tag, regular in cls.compiledMap.items():
+                match = regular.search(segment)
+                if match is not None:
+                    value = match.group(1) if regular.groups else match.group()
+                    break
+            else:
+                return segment
+
+        return cls.formatTag(tag, value) or segment
+
     @classmethod
     def format(cls, text: str, textSize="14px"):
         text = text.strip()
@@ -78,92 +159,13 @@ class TextFormatter:
 
         text = text.replace("\n\n", "<p>&nbsp;</p>")
         #text = "<p>" + text.replace("\n", "</p>\n<p>") + "</p>"
-        text = "<p>" + re.sub(r"\n(?!<el>|<plist>|<\/plist>|<nlist>|<\/nlist>)", "</p>\n<p>", text) + "</p>"
-
-        split_text = re.split(r'(\<.*?\>)', text)
-
-        for n, string in enumerate(split_text):
-            for tag, regular in cls.regularMap.items():
-                find = re.findall(regular, string)
-
-                if find:
-                    select = ""
-
-                    if tag == "size":
-                        if size := find[0].casefold():
-                            select = f"<span style=\"font-size:{size}\">"
-                    elif tag == "color":
-                        select = f"<span style=\"color:{find[0]}\">"
-                    elif tag == "bgcolor":
-                        select = f"<span style=\"background-color:{find[0]}\">"
-                    elif tag == "url":
-                        select = f"<a href=\"{find[0]}\" style=\"text-decoration: none; color:#3498db\" title=\"{find[0]}\">"
-                    elif tag == "/url":
-                        select = f"</a>"
-                    elif tag == "tooltip":
-                        select = f"<span title=\"{find[0]}\">"
-                    elif tag == "b":
-                        select = f"<strong>"
-                    elif tag == "/b":
-                        select = f"</strong>"
-                    elif tag == "i":
-                        select = f"<em>"
-                    elif tag == "/i":
-                        select = f"</em>"
-                    elif tag == "u":
-                        select = f"<u>"
-                    elif tag == "/u":
-                        select = f"</u>"
-                    elif tag == "s":
-                        select = f"<s>"
-                    elif tag == "/s":
-                        select = f"</s>"
-                    elif tag == "sup":
-                        select = f"<sup>"
-                    elif tag == "/sup":
-                        select = f"</sup>"
-                    elif tag == "sub":
-                        select = f"<sub>"
-                    elif tag == "/sub":
-                        select = f"</sub>"
-                    elif tag == "center":
-                        select = f"<p style=\"text-align:center\">"
-                    elif tag == "right":
-                        select = f"<p style=\"text-align:right\">"
-                    elif tag == "nlist":
-                        select = f"<ol>"
-                    elif tag == "/nlist":
-                        select = f"</ol>"
-                    elif tag == "plist":
-                        select = f"<ul>"
-                    elif tag == "/plist":
-                        select = f"</ul>"
-                    elif tag == "el":
-                        select = f"<li>"
-                    elif tag == "/el":
-                        select = f"</li>"
-                    elif tag == "tab":
-                        select = "&nbsp;"*4
-                    elif tag == "table":
-                        select = f"<table width=\"100%\">"
-                    elif tag == "/table":
-                        select = f"</table>"
-                    elif tag == "tr":
-                        select = f"<tr>"
-                    elif tag == "/tr":
-                        select = f"</tr>"
-                    elif tag == "td":
-                        select = f"<td>"
-                    elif tag == "/td":
-                        select = f"</td>"
-                    elif tag in ["/size", "/color", "/tooltip", "/bgcolor"]:
-                        select = "</span>"
-                    elif tag in ["/center", "/right"]:
-                        select = f"</p>"
-
-                    if select:
-                        split_text[n] = select
-                    break
+        text = "<p>" + cls.paragraphRegular.sub("</p>\n<p>", text) + "</p>"
+
+        split_text = cls.splitRegular.split(text)
+
+        # Odd segments are "<...>" matches of the split, text between them can't contain a tag
+        for n in range(1, len(split_text), 2):
+            split_text[n] = cls.replaceTag(split_text[n])
 
         return ('<html>'
                 '<head><style>'
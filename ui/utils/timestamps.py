@@ -0,0 +1,101 @@
+import os
+import json
+import atexit
+
+from typing import Dict, Optional
+
+
+class TimestampStore:
+    """
+    Mod hash -> timestamp, loaded on first access.
+    New timestamps are appended to a journal next to the snapshot file (one write per batch),
+    the journal is merged into the snapshot on exit
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.journalPath = f"{os.path.splitext(path)[0]}.journal"
+
+        self._timestamps: Optional[Dict[str, float]] = None
+        self._journaled = 0
+        self._cutLine = False
+
+        atexit.register(self.compact)
+
+    @property
+    def timestamps(self) -> Dict[str, float]:
+        if self._timestamps is None:
+            self._timestamps = self._load()
+
+        return self._timestamps
+
+    def _load(self) -> Dict[str, float]:
+        timestamps = {}
+
+        try:
+            with open(self.path, "r", encoding="UTF-8") as file:
+                timestamps.update(json.load(file))
+        except (OSError, ValueError):
+            pass
+
+        try:
+            with open(self.journalPath, "r", encoding="UTF-8") as file:
+                for line in file:
+                    # Last line may be cut if the app was killed while writing
+                    self._cutLine = not line.endswith("\n")
+                    try:
+                        modHash, timestamp = line.rstrip("\n").rsplit("\t", 1)
+                        timestamps[modHash] = float(timestamp)
+                        self._journaled += 1
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+
+        return timestamps
+
+    def __contains__(self, modHash: str) -> bool:
+        return modHash in self.timestamps
+
+    def get(self, modHash: str, default: float = None) -> Optional[float]:
+        return self.timestamps.get(modHash, default)
+
+    def update(self, timestamps: Dict[str, float]):
+        """Store new timestamps with a single journal append"""
+        if not timestamps:
+            return
+
+        self.timestamps.update(timestamps)
+
+        try:
+            with open(self.journalPath, "a", encoding="UTF-8") as file:
+                lines = "".join(f"{modHash}\t{timestamp!r}\n" for modHash, timestamp in timestamps.items())
+                file.write("\n" * self._cutLine + lines)
+                file.flush()
+                os.fsync(file.fileno())
+            self._journaled += len(timestamps)
+            self._cutLine = False
+        except OSError:
+            print(f"Warning: Could not save timestamps to {self.journalPath}")
+
+    def compact(self):
+        """Rewrite snapshot atomically with journaled timestamps and remove the journal"""
+        if self._timestamps is None or not self._journaled:
+            return
+
+        tempPath = f"{self.path}.tmp"
+        try:
+            with open(tempPath, "w", encoding="UTF-8") as file:
+                json.dump(self._timestamps, file, indent=4)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tempPath, self.path)
+            self._journaled = 0
+        except OSError:
+            print(f"Warning: Could not save timestamps to {self.path}")
+            return
+
+        try:
+            os.remove(self.journalPath)
+        except OSError:
+            pass